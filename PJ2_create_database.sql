@@ -1,6 +1,6 @@
 -- =============================================
 -- ActiveLoop Plus - Final Optimized Schema v4 (updated)
--- 10 tables + 2 views
+-- 11 tables + 2 views
 -- =============================================
 DROP DATABASE IF EXISTS eventbridge_plus;
 CREATE DATABASE eventbridge_plus CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
@@ -36,7 +36,10 @@ CREATE TABLE users (
     INDEX idx_location (location),
     INDEX idx_email (email),
     INDEX idx_username (username),
-    INDEX idx_notifications (notifications_enabled)
+    INDEX idx_notifications (notifications_enabled),
+    -- substring search for the add-member autocomplete (ngram_token_size=2;
+    -- run with innodb_ft_enable_stopword=OFF so short names are not dropped)
+    FULLTEXT INDEX ft_users_search (username, first_name, last_name, email) WITH PARSER ngram
 );
 
 -- =============================================
@@ -61,11 +64,18 @@ CREATE TABLE group_info (
     
     FOREIGN KEY (created_by) REFERENCES users(user_id) ON DELETE CASCADE,
     INDEX idx_status (status),
-    INDEX idx_created_by (created_by),
+    -- an applicant's groups by status, latest change first (application
+    -- form pre-fill); also serves the created_by foreign key
+    INDEX idx_created_by_status_updated (created_by, status, updated_at),
     INDEX idx_group_type (group_type),
     INDEX idx_status_created (status, created_at),
+    -- approved-group listing by name (InnoDB appends group_id, so keyset
+    -- paging on (name, group_id) and (created_at, group_id) stays in the index)
+    INDEX idx_status_name (status, name),
     INDEX idx_active_groups (status, is_public),
     INDEX idx_group_location (group_location),  
+    -- admin group search by name (substring phrase match)
+    FULLTEXT INDEX ft_group_name (name) WITH PARSER ngram,
     CONSTRAINT check_max_members CHECK (max_members > 0)
 );
 
@@ -92,6 +102,10 @@ CREATE TABLE group_members (
     INDEX idx_status (status),
     INDEX idx_group_role (group_role),
     INDEX idx_user_group_role (user_id, group_role, status),
+    -- member lists and counts for one group
+    INDEX idx_group_status (group_id, status, user_id, group_role),
+    -- manager/active counts and the next-manager pick for one group
+    INDEX idx_group_status_role (group_id, status, group_role, join_date),
     CONSTRAINT check_left_after_join CHECK (left_date IS NULL OR left_date >= join_date)
 );
 
@@ -141,7 +155,9 @@ CREATE TABLE event_info (
     INDEX idx_event_type (event_type),
     INDEX idx_date_status (event_date, status),
     -- helpful composite
-    INDEX idx_group_eventdate (group_id, event_date),
+    INDEX idx_group_date_status (group_id, event_date, status),
+    -- a group's scheduled upcoming events in date/time order (range scan, no filesort)
+    INDEX idx_group_status_date (group_id, status, event_date, event_time),
     CONSTRAINT check_max_participants CHECK (max_participants > 0)
 );
 
@@ -167,12 +183,19 @@ CREATE TABLE event_members (
     
     FOREIGN KEY (event_id) REFERENCES event_info(event_id) ON DELETE CASCADE,
     FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    -- Also drives "remove a user from all of a group's events" (DELETE ... JOIN
+    -- event_info): user_id range here, then event_info by PRIMARY KEY.
     UNIQUE KEY uniq_user_event (user_id, event_id),
+    -- Lookups by (membership_id, event_id) resolve through the PRIMARY KEY
+    -- (const access); event_id is only a residual check, so no extra index.
     INDEX idx_event_id (event_id),
     INDEX idx_user_id (user_id),
     INDEX idx_event_role (event_role),
     INDEX idx_participation_status (participation_status),
     INDEX idx_volunteer_status (volunteer_status),
+    -- per-member activity stats and per-event volunteer counts
+    INDEX idx_user_status (user_id, participation_status, event_id),
+    INDEX idx_event_role_status (event_id, event_role, volunteer_status),
     CONSTRAINT check_volunteer_hours_positive CHECK (volunteer_hours IS NULL OR volunteer_hours >= 0),
     CONSTRAINT check_volunteer_fields CHECK (
         (event_role = 'participant'
@@ -274,6 +297,33 @@ CREATE TABLE notifications (
     INDEX idx_user_unread (user_id, is_read)
 );
 
+-- =============================================
+-- 11) Group Approvals - Who approved each group (admin group list)
+-- =============================================
+CREATE TABLE group_approvals (
+    group_id INT PRIMARY KEY,
+    approver_id INT NOT NULL,
+    approved_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    FOREIGN KEY (group_id) REFERENCES group_info(group_id) ON DELETE CASCADE,
+    FOREIGN KEY (approver_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    -- approver filter and approver dropdown
+    INDEX idx_approver (approver_id)
+);
+
+-- Databases created before this table kept approvals as 'system'
+-- notifications ('APPROVED_GROUP:<group_id>:<name>:<admin_id>', related_id =
+-- group_id). Run once after creating the table to carry them over; rows are
+-- applied oldest first, so the latest approval of each group wins:
+--
+-- INSERT INTO group_approvals (group_id, approver_id, approved_at)
+-- SELECT n.related_id, n.user_id, n.created_at
+-- FROM notifications n
+-- JOIN group_info g ON g.group_id = n.related_id
+-- WHERE n.category = 'system' AND n.message LIKE 'APPROVED_GROUP:%'
+-- ORDER BY n.created_at, n.notification_id
+-- ON DUPLICATE KEY UPDATE approver_id = VALUES(approver_id), approved_at = VALUES(approved_at);
+
 -- =============================================
 -- Analytics Views (Analytics Epic)
 -- =============================================
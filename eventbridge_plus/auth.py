@@ -21,8 +21,9 @@ This module provides functions for:
 """
 
 from functools import wraps
-from flask import session, redirect, url_for, render_template, make_response, request
+from flask import session, redirect, url_for, render_template, make_response, request, g
 from eventbridge_plus import db, connect  
+from eventbridge_plus.util import ttl_cache
 
 # =============================================================================
 # SESSION MANAGEMENT
@@ -259,6 +260,11 @@ def can_change_group_roles_in_specific_group(target_group_id):
         if not user_id:
             return False
         
+        # Answer is cached on g for the rest of the request
+        checked = g.setdefault('_manager_of_group', {})
+        if target_group_id in checked:
+            return checked[target_group_id]
+        
         try:
             with db.get_cursor() as cursor:
                 cursor.execute("""
@@ -267,7 +273,8 @@ def can_change_group_roles_in_specific_group(target_group_id):
                     WHERE user_id = %s AND group_id = %s 
                       AND group_role = 'manager' AND status = 'active'
                 """, (user_id, target_group_id))
-                return cursor.fetchone() is not None
+                checked[target_group_id] = cursor.fetchone() is not None
+                return checked[target_group_id]
         except Exception:
             return False
     return False
@@ -414,6 +421,24 @@ def get_user_group_info(user_id):
         return None
 
 
+@ttl_cache(300)
+def get_group_manager_ids(group_id):
+    """Return a tuple of active manager user_ids for a group (cached 5 min).
+
+    Call get_group_manager_ids.invalidate(group_id) after changing a group's
+    managers.
+    """
+    with db.get_cursor() as cursor:
+        cursor.execute("""
+            SELECT DISTINCT gm.user_id
+            FROM group_members gm
+            WHERE gm.group_id = %s 
+              AND gm.group_role = 'manager' 
+              AND gm.status = 'active'
+        """, (group_id,))
+        return tuple(row['user_id'] for row in cursor.fetchall())
+
+
 def refresh_user_group_session(user_id):
     """Refresh group_id & group_role in session from DB."""
     group_info = get_user_group_info(user_id)
@@ -461,5 +486,5 @@ __all__ = [
     # compatibility / shortcuts
     'role_required', 'super_admin_required',
     # group helpers
-    'get_user_group_info', 'refresh_user_group_session',
+    'get_user_group_info', 'get_group_manager_ids', 'refresh_user_group_session',
 ]
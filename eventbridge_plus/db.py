@@ -41,8 +41,19 @@ automatically closed at the end of your query:
 >>>     # Your query here...
 ```
 
+For multi-statement writes, `with transaction() as cursor:` reads better and
+behaves the same way (see below).
+
+A `with get_cursor()` block is also a single transaction: everything executed
+inside it is committed once when the block exits normally, or rolled back if
+it exits with an exception. Nested blocks during the same request join the
+outermost block's transaction.
+
 Note that you don't have to close the database connection returned by
-`get_db()` as it will be closed automatically at the end of the Flask request.
+`get_db()` as it will be released automatically at the end of the Flask
+request. Released connections are kept in a small pool and handed to later
+requests, so the connect and time zone setup cost is only paid once per
+pooled connection.
 However, you should ensure that you close all cursors: this includes any
 created by the `get_cursor()` function, and any you create manually using the
 database connection.
@@ -52,14 +63,25 @@ References:
     [1] https://flask.palletsprojects.com/en/stable/tutorial/database/
     [2] https://pypi.org/project/mysqlclient/
 """
+import os
+import queue
+from time import monotonic
 from flask import Flask, g
 import MySQLdb
+import MySQLdb.cursors
 
 # Database connection parameters (set when calling `init_db`).
 connection_params = {}
 
+# Idle `(connection, released_at)` pairs waiting to be reused (replaced when
+# calling `init_db`).
+_pool = queue.LifoQueue(maxsize=5)
+
+# Connections idle for less than this many seconds are reused without a ping.
+PING_AFTER_IDLE = 30
+
 def init_db(app: Flask, user: str, password: str, host: str, database: str,
-            port: int = 3306, autocommit: bool = True):
+            port: int = 3306, autocommit: bool = False, pool_size: int = None):
     """Sets up MySQL connectivity for the specified Flask app.
 
     This must be called once while initialising your Flask web app, before any
@@ -72,8 +94,13 @@ def init_db(app: Flask, user: str, password: str, host: str, database: str,
         host: Host name or IP address of the MySQL server.
         database: Name of the database to connect to on the MySQL server.
         port: Port used to connect to the MySQL server (default `3306`).
-        autocommit: Whether or not to enable auto-commit (default `True`) .
+        autocommit: Whether or not to enable auto-commit (default `False`;
+            `with get_cursor()` blocks commit on exit instead).
+        pool_size: Maximum number of idle connections kept for reuse between
+            requests (default `(CPU count * 2) + 1`; `0` closes every
+            connection after use).
     """
+    global _pool
     # Save connection details.
     connection_params['user'] = user
     connection_params['password'] = password
@@ -81,18 +108,21 @@ def init_db(app: Flask, user: str, password: str, host: str, database: str,
     connection_params['database'] = database
     connection_params['port'] = port
     connection_params['autocommit'] = autocommit
+    if pool_size is None:
+        pool_size = (os.cpu_count() or 1) * 2 + 1
+    _pool = queue.LifoQueue(maxsize=pool_size) if pool_size > 0 else None
 
     # Register `close_db()` to run every time the application context is torn
     # down at the end of a Flask request, ensuring that any database connection
-    # using during that request gets closed.
+    # using during that request gets released.
     app.teardown_appcontext(close_db)
 
 def get_db():
     """Gets a MySQL database connection to use while serving the current Flask
     request.
 
-    The first time you call this during a request, a new connection will be
-    created. After that, any additional calls to `get_db()` during the same
+    The first time you call this during a request, an idle pooled connection
+    will be reused (or a new one created if none is available). After that, any additional calls to `get_db()` during the same
     request are guaranteed to return the same connection.
     
     If you only need a MySQL cursor, and not a reference to the database, you
@@ -100,7 +130,7 @@ def get_db():
     `get_db()` first.
 
     You don't need to manually close the connection returned by `get_db()` - it
-    will be closed automatically at the end of the Flask request. However, you
+    will be released automatically at the end of the Flask request. However, you
     should be sure to close any cursors that you create, including any created
     by the `get_cursor()` function.
 
@@ -108,18 +138,67 @@ def get_db():
         A `Connection` instance.
     """
     if 'db' not in g:
-        g.db = MySQLdb.connect(**connection_params)
-        # Set timezone to New Zealand for consistent datetime handling
-        # Only set timezone if not already in NZ timezone (for PythonAnywhere)
-        cursor = g.db.cursor()
-        cursor.execute("SELECT @@session.time_zone")
-        current_tz = cursor.fetchone()[0]
-        if current_tz == 'UTC' or current_tz == 'SYSTEM':
-            cursor.execute("SET time_zone = '+13:00'")  # New Zealand timezone (DST)
-        cursor.close()
+        g.db = _checkout()
 
     return g.db
 
+def _connect():
+    """Opens a new MySQL connection with the session settings this app expects."""
+    connection = MySQLdb.connect(**connection_params)
+    # Set timezone to New Zealand for consistent datetime handling
+    # Only set timezone if not already in NZ timezone (for PythonAnywhere)
+    cursor = connection.cursor()
+    cursor.execute("SELECT @@session.time_zone")
+    current_tz = cursor.fetchone()[0]
+    if current_tz == 'UTC' or current_tz == 'SYSTEM':
+        cursor.execute("SET time_zone = '+13:00'")  # New Zealand timezone (DST)
+    cursor.close()
+    return connection
+
+def _checkout():
+    """Takes a live connection from the pool, or opens a new one."""
+    while _pool is not None:
+        try:
+            connection, released_at = _pool.get_nowait()
+        except queue.Empty:
+            break
+        if monotonic() - released_at < PING_AFTER_IDLE:
+            # Too recently used to have hit the server's wait_timeout
+            return connection
+        try:
+            connection.ping()
+            return connection
+        except MySQLdb.Error:
+            # Dropped by the server while idle (e.g. wait_timeout)
+            try:
+                connection.close()
+            except MySQLdb.Error:
+                pass
+    return _connect()
+
+class TransactionCursor(MySQLdb.cursors.DictCursor):
+    """A `DictCursor` whose `with` block is one transaction.
+
+    Only the outermost `with` block of the current application context
+    commits (or rolls back on an exception), so nested helpers that open
+    their own cursor share the caller's transaction.
+    """
+
+    def __enter__(self):
+        g._tx_depth = g.get('_tx_depth', 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        g._tx_depth -= 1
+        try:
+            if g._tx_depth == 0:
+                if exc_type is None:
+                    self.connection.commit()
+                else:
+                    self.connection.rollback()
+        finally:
+            self.close()
+
 def get_cursor():
     """Gets a new MySQL dictionary cursor to use while serving the current
     Flask request.
@@ -131,13 +210,27 @@ def get_cursor():
     Ensure that you close all cursors before the end of the Flask request.
     
     Returns:
-        A new `MySQLdb.cursors.DictCursor` instance.
+        A new `TransactionCursor` (a `MySQLdb.cursors.DictCursor`) instance.
+    """
+    return get_db().cursor(cursorclass=TransactionCursor)
+
+def transaction():
+    """Gets a cursor for a block of statements that must succeed or fail
+    together.
+
+    This is `get_cursor()` under a name that states the intent: use it as
+    `with db.transaction() as cursor:` and every statement in the block is
+    committed once on exit (a single commit for the whole unit of work), or
+    rolled back if the block raises.
+
+    Returns:
+        A new `TransactionCursor` instance.
     """
-    return get_db().cursor(cursorclass=MySQLdb.cursors.DictCursor)
+    return get_cursor()
 
 def close_db(exception = None):
-    """Closes the MySQL database connection associated with the current Flask
-    request (if any).
+    """Releases the MySQL database connection associated with the current Flask
+    request (if any) back to the pool, or closes it if the pool is full.
     
     There should be no need to call this manually: this function is called
     automatically when the application context is torn down at the end of each
@@ -152,4 +245,11 @@ def close_db(exception = None):
     db = g.pop('db', None)
     
     if db is not None:
-        db.close()
+        try:
+            # Never hand uncommitted work on to the next request
+            db.rollback()
+            if _pool is None:
+                raise queue.Full
+            _pool.put_nowait((db, monotonic()))
+        except (MySQLdb.Error, queue.Full):
+            db.close()
@@ -9,6 +9,7 @@ Features:
 - Real-time capacity tracking
 """
 
+import logging
 from datetime import datetime, date, time, timedelta
 from flask import render_template, request, redirect, url_for, flash, session, abort, jsonify
 from eventbridge_plus import db, noti
@@ -23,8 +24,29 @@ from eventbridge_plus.auth import (
     is_super_admin,
     is_support_technician,
     is_group_manager,
+    get_group_manager_ids,
 )
+from eventbridge_plus.group_manager import invalidate_membership_caches
+from eventbridge_plus.groups import invalidate_group_detail_cache
 from eventbridge_plus.util import AVAILABLE_EVENT_TYPES, AVAILABLE_LOCATIONS, nz_date
+
+logger = logging.getLogger(__name__)
+
+# Volunteer application write. (user_id, event_id) is UNIQUE, so this inserts a
+# new application, re-opens a cancelled one, or is a no-op otherwise.
+# cursor.rowcount: 1 = inserted, 2 = re-opened, 0 = left unchanged.
+_VOLUNTEER_UPSERT_SQL = """
+    INSERT INTO event_members (
+        event_id, user_id, event_role, 
+        participation_status, volunteer_status
+    )
+    VALUES (%s, %s, 'volunteer', 'registered', %s)
+    ON DUPLICATE KEY UPDATE volunteer_status = IF(
+        event_role = 'volunteer' AND volunteer_status = 'cancelled',
+        VALUES(volunteer_status), volunteer_status
+    )
+"""
+
 # --- NEW: volunteer roles used by form & DB ---
 
 
@@ -1189,6 +1211,7 @@ def register_event_routes(app):
                     cursor.connection.commit()
                 except Exception:
                     pass
+                invalidate_group_detail_cache(group_id)
 
                 flash("Event created successfully!", "success")
                 return redirect(url_for("manage_events"))
@@ -1676,6 +1699,7 @@ def register_event_routes(app):
                     cursor.connection.commit()
                 except Exception:
                     pass
+                invalidate_group_detail_cache(event["group_id"])
 
                 flash("Event updated successfully!", "success")
                 return redirect(url_for("manage_events"))
@@ -1702,6 +1726,9 @@ def register_event_routes(app):
                 return render_template("access_denied.html"), 403
 
             with db.get_cursor() as cursor:
+                cursor.execute("SELECT group_id FROM event_info WHERE event_id = %s", (event_id,))
+                deleted = cursor.fetchone()
+
                 # Best-effort cleanup of related rows first (if present)
                 try:
                     cursor.execute("DELETE FROM event_members WHERE event_id = %s", (event_id,))
@@ -1719,6 +1746,8 @@ def register_event_routes(app):
                 except Exception:
                     pass
 
+            if deleted:
+                invalidate_group_detail_cache(deleted["group_id"])
             flash("Event deleted successfully.", "success")
             return redirect(url_for("manage_events"))
 
@@ -1990,7 +2019,11 @@ def register_event_routes(app):
                     f'Successfully registered for "{event["event_title"]}"!',
                     "success",
                 )
-                return redirect(url_for("event_detail", event_id=event_id))
+
+            # Only once the auto-join has been committed
+            if not group_membership:
+                invalidate_membership_caches(event["group_id"])
+            return redirect(url_for("event_detail", event_id=event_id))
 
         except Exception as e:
             print(f"Error registering for event: {e}")
@@ -2118,15 +2151,11 @@ def register_event_routes(app):
                         status = existing.get("volunteer_status", "pending")
                         if status == "cancelled":
                             # Allow reapplication for cancelled/rejected volunteers
-                            cursor.execute(
-                                """
-                                UPDATE event_members
-                                SET volunteer_status = 'assigned'
-                                WHERE user_id = %s AND event_id = %s AND event_role = 'volunteer'
-                                """,
-                                (user_id, event_id),
-                            )
-                            flash("Volunteer application resubmitted! Please wait for manager approval.", "success")
+                            cursor.execute(_VOLUNTEER_UPSERT_SQL, (event_id, user_id, 'assigned'))
+                            if cursor.rowcount:
+                                flash("Volunteer application resubmitted! Please wait for manager approval.", "success")
+                            else:
+                                flash("You have already applied as volunteer.", "info")
                         else:
                             flash(
                                 f"You have already applied as volunteer (status: {status}).",
@@ -2231,130 +2260,42 @@ def register_event_routes(app):
                         f'Your volunteer application for "{event["event_title"]}" has been submitted. '
                         f"Please wait for group manager approval."
                     )
-                cursor.execute(
-                    """
-                    INSERT INTO event_members (
-                        event_id, user_id, event_role, 
-                        participation_status, volunteer_status
-                    )
-                    VALUES (%s, %s, 'volunteer', 'registered', %s)
-                    """,
-                    (event_id, user_id, volunteer_status),
-                )
+                cursor.execute(_VOLUNTEER_UPSERT_SQL, (event_id, user_id, volunteer_status))
+                if cursor.rowcount == 0:
+                    # A concurrent request created the row after our check
+                    flash("You have already applied as volunteer.", "info")
+                    return redirect(url_for("event_detail", event_id=event_id))
 
-                # Notify applicant
-                try:
-                    noti.create_noti(
-                    user_id=user_id,
-                        title=notification_title,
-                        message=notification_message,
-                    category="volunteer",
-                    related_id=event_id,
-                )
-                except Exception:
-                    pass
+            flash(flash_message, "success")
 
-                flash(flash_message, "success")
+            # Notify once the volunteer row has been committed
+            noti.enqueue(
+                user_id=user_id,
+                title=notification_title,
+                message=notification_message,
+                category="volunteer",
+                related_id=event_id,
+            )
 
-                # Only notify managers if it's not a group volunteer (requires approval)
-                if not is_group_volunteer:
-                    cursor.execute(
-                    """
-                    SELECT DISTINCT gm.user_id
-                    FROM group_members gm
-                    WHERE gm.group_id = %s 
-                      AND gm.group_role = 'manager' 
-                      AND gm.status = 'active'
-                    """,
-                    (event["group_id"],),
+            # Only notify managers if it's not a group volunteer (requires approval)
+            if not is_group_volunteer:
+                noti.enqueue_many(
+                    get_group_manager_ids(event["group_id"]),
+                    title="New Volunteer Application",
+                    message=(
+                        f'New volunteer application for "{event["event_title"]}" '
+                        f"awaiting your review."
+                    ),
+                    category="volunteer",
+                    related_id=event_id,
                 )
-                managers = cursor.fetchall()
-
-                for manager in managers:
-                    noti.create_noti(
-                        user_id=manager["user_id"],
-                        title="New Volunteer Application",
-                        message=(
-                            f'New volunteer application for "{event["event_title"]}" '
-                            f"awaiting your review."
-                        ),
-                        category="volunteer",
-                        related_id=event_id,
-                    )
-                # flash already handled above
-                return redirect(url_for("event_detail", event_id=event_id))
+            return redirect(url_for("event_detail", event_id=event_id))
 
-        except Exception as e:
-            print(f"Error in volunteer application: {e}")
+        except Exception:
+            logger.exception("volunteer apply failed")
             flash("An error occurred while submitting volunteer application.", "error")
             return redirect(url_for("search_events"))
 
-    # =============================================================================
-    # UTILITY FUNCTIONS
-    # =============================================================================
-    def get_user_events(user_id, include_past=False):
-        """Get events for a specific user (both participation and volunteering)"""
-        try:
-            with db.get_cursor() as cursor:
-                date_filter = "AND e.event_date >= CURDATE()" if not include_past else ""
-                cursor.execute(
-                    f"""
-                    SELECT 
-                        e.event_id, e.event_title, e.event_type, e.event_date,
-                        e.event_time, e.location, e.status AS event_status,
-                        g.name AS group_name,
-                        em.event_role, em.participation_status, em.volunteer_status,
-                        em.volunteer_hours, em.responsibility
-                    FROM event_members em
-                    JOIN event_info e ON em.event_id = e.event_id
-                    JOIN group_info g ON e.group_id = g.group_id
-                    WHERE em.user_id = %s {date_filter}
-                    ORDER BY e.event_date DESC
-                    """,
-                    (user_id,),
-                )
-                return cursor.fetchall()
-        except Exception as e:
-            print(f"Error getting user events: {e}")
-            return []
-
-    def get_group_events(group_id, limit=None):
-        """Get events for a specific group"""
-        try:
-            with db.get_cursor() as cursor:
-                limit_clause = f"LIMIT {limit}" if limit else ""
-                cursor.execute(
-                    f"""
-                    SELECT 
-                        e.event_id, e.event_title, e.event_type, e.event_date,
-                        e.event_time, e.location, e.max_participants, e.status,
-                        COUNT(em.membership_id) AS registered_count
-                    FROM event_info e
-                    LEFT JOIN event_members em ON e.event_id = em.event_id
-                      AND em.participation_status IN ('registered', 'attended')
-                      AND (em.event_role != 'volunteer' OR em.volunteer_status IS NULL OR em.volunteer_status != 'cancelled')
-                    WHERE e.group_id = %s
-                    GROUP BY e.event_id, e.group_id, e.event_title, e.event_type, e.event_date,
-                             e.event_time, e.location, e.max_participants, e.status
-                    ORDER BY e.event_date DESC
-                    {limit_clause}
-                    """,
-                    (group_id,),
-                )
-                events = cursor.fetchall()
-
-                for ev in events:
-                    ev["spots_available"] = (
-                        ev["max_participants"] - ev["registered_count"]
-                    )
-                    ev["is_full"] = ev["spots_available"] <= 0
-                    ev["is_upcoming"] = ev["event_date"] >= date.today()
-
-                return events
-        except Exception as e:
-            print(f"Error getting group events: {e}")
-            return []
-
     @app.route("/events/<int:event_id>/participants/remove", methods=['POST'], endpoint='remove_event_participant')
     @require_login
     def remove_event_participant(event_id):
@@ -2399,27 +2340,31 @@ def register_event_routes(app):
                     WHERE membership_id = %s AND event_id = %s
                 """, (membership_id, event_id))
                 
-                # Send notification to the removed participant
-                noti.create_noti(
-                    user_id=participant['user_id'],
-                    title="Removed from Event",
-                    message=f'You have been removed from "{participant["event_title"]}" by the event manager.',
-                    category="event",
-                    related_id=event_id,
-                )
-                
-                flash(f'Successfully removed {participant["first_name"]} {participant["last_name"]} from the event.', 'success')
-                return redirect(url_for('event_detail', event_id=event_id))
+            # Send notification to the removed participant once the delete is committed
+            noti.enqueue(
+                user_id=participant['user_id'],
+                title="Removed from Event",
+                message=f'You have been removed from "{participant["event_title"]}" by the event manager.',
+                category="event",
+                related_id=event_id,
+            )
+            
+            flash(f'Successfully removed {participant["first_name"]} {participant["last_name"]} from the event.', 'success')
+            return redirect(url_for('event_detail', event_id=event_id))
                 
-        except Exception as e:
-            print(f"Error removing participant: {e}")
+        except Exception:
+            logger.exception("remove event participant failed")
             flash('An error occurred while removing the participant.', 'error')
             return redirect(url_for('event_detail', event_id=event_id))
 
+    # Session debug page; app.debug is read per request because run.py only
+    # turns debug on in app.run(), after the routes have been registered
     @app.route("/debug/session")
     @require_login
     def debug_session():
-        """Debug route to check session values"""
+        """Debug route to check session values (404 outside debug mode)"""
+        if not app.debug:
+            abort(404)
         return f"""
         <h2>Session Debug Info</h2>
         <ul>
@@ -2437,9 +2382,12 @@ def register_event_routes(app):
     def add_event_member():
         """Add a new member to an event"""
         user_id = get_current_user_id()
-        event_id = request.form.get('event_id', type=int)
-        member_user_id = request.form.get('user_id', type=int)
-        member_role = request.form.get('member_role', '').strip()
+        form = request.form
+        event_id = form.get('event_id', '')
+        event_id = int(event_id) if event_id.isdigit() else None
+        member_user_id = form.get('user_id', '')
+        member_user_id = int(member_user_id) if member_user_id.isdigit() else None
+        member_role = form.get('member_role', '').strip()
         
         if not event_id or not member_user_id or not member_role:
             flash('Missing required information.', 'error')
@@ -2580,21 +2528,15 @@ def register_event_routes(app):
                     if group_max_members and group_current_count >= group_max_members:
                         flash('Cannot add member: Group is at maximum capacity.', 'error')
                         return redirect(url_for('event_detail', event_id=event_id))
-                    
+                
+                # Group auto-join and event registration commit together when
+                # the with block exits (or both roll back)
+                if not group_membership:
                     # Add user to the group
                     cur.execute("""
                         INSERT INTO group_members (user_id, group_id, group_role, status, join_date)
                         VALUES (%s, %s, 'member', 'active', NOW())
                     """, (member_user_id, event_info['group_id']))
-                    
-                    # Create notification for group membership
-                    noti.create_noti(
-                        user_id=member_user_id,
-                        title="Added to Group",
-                        message=f'You have been automatically added to the group "{event_info["group_name"]}" as you were added to their event.',
-                        category="group",
-                        related_id=event_info['group_id'],
-                    )
                 
                 # Add the member to the event
                 cur.execute("""
@@ -2602,19 +2544,31 @@ def register_event_routes(app):
                     VALUES (%s, %s, %s, 'registered', NOW())
                 """, (member_user_id, event_id, member_role))
                 
-                # Create notification for the added user
-                noti.create_noti(
+            # Notifications go out once the registration has been committed
+            if not group_membership:
+                invalidate_membership_caches(event_info['group_id'])
+                # Create notification for group membership
+                noti.enqueue(
                     user_id=member_user_id,
-                    title="Added to Event",
-                    message=f'You have been added to "{event_info["event_title"]}" by the event manager.',
-                    category="event",
-                    related_id=event_id,
+                    title="Added to Group",
+                    message=f'You have been automatically added to the group "{event_info["group_name"]}" as you were added to their event.',
+                    category="group",
+                    related_id=event_info['group_id'],
                 )
+            
+            # Create notification for the added user
+            noti.enqueue(
+                user_id=member_user_id,
+                title="Added to Event",
+                message=f'You have been added to "{event_info["event_title"]}" by the event manager.',
+                category="event",
+                related_id=event_id,
+            )
+            
+            flash(f'Successfully added {user_info["first_name"]} {user_info["last_name"]} to the event.', 'success')
                 
-                flash(f'Successfully added {user_info["first_name"]} {user_info["last_name"]} to the event.', 'success')
-                
-        except Exception as e:
-            print(f"Error adding event member: {e}")
+        except Exception:
+            logger.exception("add event member failed")
             flash('An error occurred while adding the member.', 'error')
         
         return redirect(url_for('event_detail', event_id=event_id))
\ No newline at end of file
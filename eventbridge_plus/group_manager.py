@@ -1,4 +1,7 @@
 # eventbridge_plus/group_manager.py
+import logging
+import re
+import MySQLdb
 from eventbridge_plus import app, db, noti
 from flask import render_template, request, redirect, url_for, flash, session, jsonify
 from .auth import (
@@ -7,9 +10,332 @@ from .auth import (
     is_super_admin, 
     is_support_technician,
     is_group_manager,
-    can_change_group_roles_in_specific_group
+    can_change_group_roles_in_specific_group,
+    get_group_manager_ids
 )
-from .util import get_pagination_params, create_pagination_info, create_pagination_links
+from .util import (
+    get_pagination_params,
+    create_pagination_info,
+    create_pagination_links,
+    encode_page_cursor,
+    decode_page_cursor,
+    ttl_cache,
+    FULLTEXT_OPERATORS
+)
+
+logger = logging.getLogger(__name__)
+
+# Admin group list orderings: (ORDER BY clause, keyset condition that selects
+# the rows after a given (sort value, group_id) pair, sort column)
+_GROUP_LIST_ORDERS = {
+    'newest': ("g.created_at DESC, g.group_id DESC", "(g.created_at, g.group_id) < (%s, %s)", 'created_at'),
+    'oldest': ("g.created_at ASC, g.group_id ASC", "(g.created_at, g.group_id) > (%s, %s)", 'created_at'),
+    'name_asc': ("g.name ASC, g.group_id ASC", "(g.name, g.group_id) > (%s, %s)", 'name'),
+    'name_desc': ("g.name DESC, g.group_id DESC", "(g.name, g.group_id) < (%s, %s)", 'name'),
+}
+
+_GROUP_SEARCH_CONDITION = "AND LOWER(g.name) LIKE LOWER(%s)"
+
+# Deferred join: pick the page's group_ids first, then join and aggregate
+# members only for those rows. The window count is taken before LIMIT, so it
+# also gives the number of matches.
+_GROUP_LIST_SQL = """
+    SELECT g.group_id, g.name, g.group_type, g.status, g.max_members,
+           COUNT(gm.membership_id) as current_members, g.created_at, g.is_public,
+           pick.matched
+    FROM group_info g
+    JOIN (
+        SELECT g.group_id, COUNT(*) OVER () AS matched
+        FROM group_info g
+        WHERE g.status = 'approved' {search_condition} {page_condition}
+        ORDER BY {order_clause}
+        {limit_clause}
+    ) pick ON pick.group_id = g.group_id
+    LEFT JOIN group_members gm ON g.group_id = gm.group_id AND gm.status = 'active'
+    GROUP BY g.group_id, g.name, g.group_type, g.status, g.max_members, g.created_at, g.is_public,
+             pick.matched
+    ORDER BY {order_clause}
+"""
+
+# One complete statement per (sort, searching, keyset page) combination
+_GROUP_LIST_QUERIES = {
+    (sort, searching, keyset): _GROUP_LIST_SQL.format(
+        search_condition=_GROUP_SEARCH_CONDITION if searching else "",
+        page_condition=f"AND {seek_condition}" if keyset else "",
+        order_clause=order_clause,
+        limit_clause="LIMIT %s" if keyset else "LIMIT %s OFFSET %s",
+    )
+    for sort, (order_clause, seek_condition, _) in _GROUP_LIST_ORDERS.items()
+    for searching in (False, True)
+    for keyset in (False, True)
+}
+
+_GROUP_COUNT_QUERIES = {
+    searching: f"""
+        SELECT COUNT(*) as total
+        FROM group_info g
+        WHERE g.status = 'approved' {_GROUP_SEARCH_CONDITION if searching else ""}
+    """
+    for searching in (False, True)
+}
+
+# Member list orderings for the membership page
+_MEMBER_ORDERS = {
+    'role': "gm.group_role DESC, u.first_name, u.last_name",
+    'name_asc': "u.first_name ASC, u.last_name ASC",
+    'name_desc': "u.first_name DESC, u.last_name DESC",
+    'join_date_asc': "gm.join_date ASC",
+    'join_date_desc': "gm.join_date DESC",
+    'status': "gm.status ASC, u.first_name, u.last_name",
+}
+
+_MEMBER_LIST_QUERIES = {
+    sort: f"""
+        SELECT gm.membership_id, gm.user_id, gm.group_role, gm.status, gm.join_date,
+               u.username, u.first_name, u.last_name, u.user_image
+        FROM group_members gm
+        JOIN users u ON gm.user_id = u.user_id
+        WHERE gm.group_id = %s
+        ORDER BY {order_clause}
+    """
+    for sort, order_clause in _MEMBER_ORDERS.items()
+}
+
+# Group statistics for the membership page (US-GM-08) plus the pending
+# request count, one scalar subquery per figure so the whole set comes back
+# in a single round-trip
+_GROUP_STATS_SQL = """
+    SELECT
+        (SELECT COUNT(*)
+         FROM group_members
+         WHERE group_id = %(group_id)s AND status = 'pending') AS pending_count,
+        (SELECT COUNT(*)
+         FROM event_info e
+         WHERE e.group_id = %(group_id)s) AS event_registration_count,
+        (SELECT COUNT(DISTINCT em.user_id)
+         FROM event_members em
+         JOIN event_info e ON em.event_id = e.event_id
+         WHERE e.group_id = %(group_id)s AND em.participation_status = 'registered'
+           AND e.event_date >= CURDATE() AND e.status = 'scheduled') AS upcoming_participants_count,
+        (SELECT COUNT(*)
+         FROM event_members em
+         JOIN event_info e ON em.event_id = e.event_id
+         WHERE e.group_id = %(group_id)s AND em.event_role = 'volunteer'
+           AND em.volunteer_status = 'confirmed'
+           AND e.event_date < CURDATE()) AS volunteer_count,
+        (SELECT COUNT(*)
+         FROM event_members em
+         JOIN event_info e ON em.event_id = e.event_id
+         WHERE e.group_id = %(group_id)s AND em.event_role = 'volunteer'
+           AND em.volunteer_status = 'assigned'
+           AND e.status = 'scheduled'
+           AND e.event_date >= CURDATE()) AS pending_volunteer_count,
+        (SELECT COUNT(*)
+         FROM group_members gm
+         WHERE gm.group_id = %(group_id)s AND gm.status = 'active') AS total_members,
+        (SELECT COUNT(*)
+         FROM group_members gm
+         WHERE gm.group_id = %(group_id)s AND gm.status = 'active'
+           AND EXISTS (SELECT 1
+                       FROM event_members em
+                       JOIN event_info e ON em.event_id = e.event_id
+                       WHERE em.user_id = gm.user_id AND e.group_id = gm.group_id)) AS participating_members,
+        (SELECT COUNT(*)
+         FROM event_info e
+         WHERE e.group_id = %(group_id)s AND e.status = 'scheduled'
+           AND e.event_date >= CURDATE()) AS upcoming_event_count,
+        att.past_participants_count,
+        att.attendance_count
+    FROM (
+        -- Actual attendees (including those with race results), all-time and
+        -- past events only, from one pass over the race_results join.
+        -- race_results is keyed by membership_id, so each event_members row
+        -- appears once and plain counts need no DISTINCT.
+        SELECT
+            COUNT(CASE WHEN e.event_date < CURDATE() THEN 1 END) AS past_participants_count,
+            COUNT(*) AS attendance_count
+        FROM event_members em
+        JOIN event_info e ON em.event_id = e.event_id
+        LEFT JOIN race_results rr ON em.membership_id = rr.membership_id
+        WHERE e.group_id = %(group_id)s
+          AND (em.participation_status = 'attended'
+               OR (rr.start_time IS NOT NULL
+                   AND rr.finish_time IS NOT NULL
+                   AND rr.finish_time > rr.start_time))
+    ) att
+"""
+
+# Selected group with its active member count
+_SELECTED_GROUP_SQL = """
+    SELECT g.group_id, g.name, g.group_type, g.status, g.max_members,
+           COUNT(gm.membership_id) as current_members, g.created_at, g.is_public
+    FROM group_info g
+    LEFT JOIN group_members gm ON g.group_id = gm.group_id AND gm.status = 'active'
+    WHERE g.group_id = %s
+    GROUP BY g.group_id, g.name, g.group_type, g.status, g.max_members, g.created_at, g.is_public
+"""
+
+# Selected group for a group manager; returns no row unless the user is an
+# active manager of it
+_MANAGER_SELECTED_GROUP_SQL = """
+    SELECT g.group_id, g.name, g.group_type, g.status, g.max_members,
+           COUNT(gm.membership_id) as current_members, g.created_at, g.is_public
+    FROM group_info g
+    LEFT JOIN group_members gm ON g.group_id = gm.group_id AND gm.status = 'active'
+    WHERE g.group_id = %s
+      AND EXISTS (
+          SELECT 1 FROM group_members user_gm
+          WHERE user_gm.group_id = g.group_id AND user_gm.user_id = %s
+            AND user_gm.group_role = 'manager' AND user_gm.status = 'active'
+      )
+    GROUP BY g.group_id, g.name, g.group_type, g.status, g.max_members, g.created_at, g.is_public
+"""
+
+# Past activity per member, for a tuple of user_ids bound to IN %s
+_MEMBER_STATS_SQL = """
+    SELECT 
+        em.user_id,
+        COUNT(*) as total_events_attended,
+        SUM(CASE WHEN em.event_role = 'volunteer' AND em.volunteer_status = 'confirmed' THEN 1 ELSE 0 END) as volunteer_events_count,
+        MAX(e.event_date) as last_event_date
+    FROM event_members em 
+    JOIN event_info e ON em.event_id = e.event_id 
+    WHERE em.user_id IN %s 
+      AND em.participation_status IN ('registered', 'attended')
+      AND e.event_date <= CURDATE()
+    GROUP BY em.user_id
+"""
+
+# Add-member autocomplete: ngram FULLTEXT phrase search, with the original
+# LIKE scan as the fallback
+_USER_SEARCH_FULLTEXT_SQL = """
+    SELECT user_id, username, first_name, last_name, email
+    FROM users
+    WHERE MATCH(username, first_name, last_name, email) AGAINST (%s IN BOOLEAN MODE)
+      AND status = 'active'
+    ORDER BY first_name, last_name
+    LIMIT 10
+"""
+
+_USER_SEARCH_LIKE_SQL = """
+    SELECT user_id, username, first_name, last_name, email
+    FROM users
+    WHERE (LOWER(username) LIKE LOWER(%s) OR LOWER(first_name) LIKE LOWER(%s) OR LOWER(last_name) LIKE LOWER(%s) OR LOWER(email) LIKE LOWER(%s))
+      AND status = 'active'
+    ORDER BY first_name, last_name
+    LIMIT 10
+"""
+
+# Event id in a PENDING_EVENT_REGISTRATION message ("event_id:<id>|event_title:...")
+_EVENT_ID_RE = re.compile(r'event_id:(\d+)')
+
+# Event to auto-register an approved member for: the event they asked to join
+# (pri 0) if it is still open, otherwise the group's next upcoming event (pri 1).
+# Registrations are counted only for the event that was picked.
+_TARGET_EVENT_SQL = """
+    SELECT t.event_id, t.event_title, t.max_participants,
+           (SELECT COUNT(*)
+            FROM event_members em
+            WHERE em.event_id = t.event_id
+              AND em.participation_status IN ('registered', 'attended')) as registered_count
+    FROM (
+        (SELECT 0 AS pri, e.event_id, e.event_title, e.max_participants
+         FROM event_info e
+         WHERE e.event_id = %(event_id)s AND e.group_id = %(group_id)s AND e.status = 'scheduled'
+             AND e.event_date >= CURDATE())
+        UNION ALL
+        (SELECT 1 AS pri, e.event_id, e.event_title, e.max_participants
+         FROM event_info e
+         WHERE e.group_id = %(group_id)s AND e.status = 'scheduled'
+             AND e.event_date >= CURDATE()
+         ORDER BY e.event_date ASC
+         LIMIT 1)
+        ORDER BY pri
+        LIMIT 1
+    ) t
+"""
+
+
+@ttl_cache(15)
+def _search_active_users(query):
+    """Return up to 10 active users whose name, username or email contains query.
+
+    Cached for 15 seconds per lower-cased query, since autocomplete sends the
+    same prefixes repeatedly.
+    """
+    with db.get_cursor() as cur:
+        if not FULLTEXT_OPERATORS.search(query):
+            try:
+                cur.execute(_USER_SEARCH_FULLTEXT_SQL, (f'"{query}"',))
+                return tuple(cur.fetchall())
+            except MySQLdb.OperationalError:
+                # ft_users_search has not been created on this database
+                pass
+        
+        pattern = f'%{query}%'
+        cur.execute(_USER_SEARCH_LIKE_SQL, (pattern, pattern, pattern, pattern))
+        return tuple(cur.fetchall())
+
+
+@ttl_cache(60)
+def _fetch_admin_groups():
+    """Approved groups with member counts for the admin group dropdown (cached 60s).
+
+    Member counts are aggregated per group_id on the (group_id, status) index
+    before the join, instead of grouping by every group_info column.
+    """
+    with db.get_cursor() as cur:
+        cur.execute("""
+            SELECT g.group_id, g.name, g.group_type, g.status, g.max_members,
+                   COALESCE(mc.current_members, 0) as current_members, g.created_at, g.is_public
+            FROM group_info g
+            LEFT JOIN (
+                SELECT group_id, COUNT(*) as current_members
+                FROM group_members
+                WHERE status = 'active'
+                GROUP BY group_id
+            ) mc ON mc.group_id = g.group_id
+            WHERE g.status = 'approved'
+            ORDER BY g.name
+        """)
+        return tuple(cur.fetchall())
+
+
+@ttl_cache(60)
+def _fetch_manager_groups(user_id):
+    """Groups a user actively manages, with member counts (cached 60s)."""
+    with db.get_cursor() as cur:
+        cur.execute("""
+            SELECT g.group_id, g.name, g.group_type, g.status, g.max_members,
+                   COUNT(gm.membership_id) as current_members, g.created_at, g.is_public
+            FROM group_info g
+            LEFT JOIN group_members gm ON g.group_id = gm.group_id AND gm.status = 'active'
+            JOIN group_members user_gm ON g.group_id = user_gm.group_id
+            WHERE user_gm.user_id = %s AND user_gm.group_role = 'manager' AND user_gm.status = 'active'
+            GROUP BY g.group_id, g.name, g.group_type, g.status, g.max_members, g.created_at, g.is_public
+            ORDER BY g.name
+        """, (user_id,))
+        return tuple(cur.fetchall())
+
+
+@ttl_cache(30)
+def _fetch_group_stats(group_id):
+    """Pending count and group statistics for one group (cached 30s).
+
+    Membership changes invalidate the entry straight away; event-side figures
+    may lag by up to the TTL.
+    """
+    with db.get_cursor() as cur:
+        cur.execute(_GROUP_STATS_SQL, {'group_id': group_id})
+        return cur.fetchone()
+
+
+def invalidate_membership_caches(group_id):
+    """Drop the cached membership-page group lists and the group's statistics
+    after group or membership changes."""
+    _fetch_admin_groups.cache_clear()
+    _fetch_manager_groups.cache_clear()
+    _fetch_group_stats.invalidate(group_id)
 
 # =============================================================================
 # MEMBERSHIP MANAGEMENT ROUTES
@@ -29,50 +355,48 @@ def membership_management():
     group_search = request.args.get('group_search', '').strip()
     page, per_page = get_pagination_params(request, default_per_page=10)
     
-    if is_super_admin() or is_support_technician():
+    # Evaluate the role checks once for the whole request
+    admin_view = is_super_admin() or is_support_technician()
+    
+    if admin_view:
         # Super admin and support technician can access any group
         if not group_id:
             # Show group selection page with sorting, pagination, and search
             with db.get_cursor() as cur:
-                # Build search condition
-                search_condition = ""
-                search_params = []
-                if group_search:
-                    search_condition = "AND LOWER(g.name) LIKE LOWER(%s)"
-                    search_params.append(f"%{group_search}%")
-                
-                # First get total count with search
-                cur.execute(f"""
-                    SELECT COUNT(DISTINCT g.group_id) as total
-                    FROM group_info g
-                    WHERE g.status = 'approved' {search_condition}
-                """, search_params)
-                total_groups = cur.fetchone()['total']
+                # Build search params
+                searching = bool(group_search)
+                search_params = [f"%{group_search}%"] if searching else []
                 
-                # Build order clause
-                order_clause = "g.created_at DESC"  # Default to newest
-                if group_sort == 'oldest':
-                    order_clause = "g.created_at ASC"
-                elif group_sort == 'name_asc':
-                    order_clause = "g.name ASC"
-                elif group_sort == 'name_desc':
-                    order_clause = "g.name DESC"
+                # Pick the ordering (group_id breaks ties so keyset paging is stable)
+                if group_sort not in _GROUP_LIST_ORDERS:
+                    group_sort = 'newest'
+                sort_column = _GROUP_LIST_ORDERS[group_sort][2]
                 
-                # Calculate offset for pagination
-                offset = (page - 1) * per_page
+                # "Next" links carry the last row's sort key, so the following
+                # page can seek past it instead of skipping OFFSET rows (a
+                # malformed client-supplied key falls back to OFFSET)
+                after = decode_page_cursor(request.args.get('after'))
+                keyset = (page > 1 and bool(after) and len(after) == 3 and after[0] == group_sort
+                          and isinstance(after[1], str) and type(after[2]) is int)
+                if keyset:
+                    page_params = search_params + after[1:] + [per_page]
+                else:
+                    page_params = search_params + [per_page, (page - 1) * per_page]
                 
-                cur.execute(f"""
-                    SELECT g.group_id, g.name, g.group_type, g.status, g.max_members,
-                           COUNT(gm.membership_id) as current_members, g.created_at, g.is_public
-                    FROM group_info g
-                    LEFT JOIN group_members gm ON g.group_id = gm.group_id AND gm.status = 'active'
-                    WHERE g.status = 'approved' {search_condition}
-                    GROUP BY g.group_id, g.name, g.group_type, g.status, g.max_members, g.created_at, g.is_public
-                    ORDER BY {order_clause}
-                    LIMIT %s OFFSET %s
-                """, search_params + [per_page, offset])
+                cur.execute(_GROUP_LIST_QUERIES[(group_sort, searching, keyset)], page_params)
                 available_groups = cur.fetchall()
                 
+                if available_groups:
+                    # A keyset page only matches the rows from this page onwards
+                    skipped = (page - 1) * per_page if keyset else 0
+                    total_groups = skipped + available_groups[0]['matched']
+                elif page > 1:
+                    # Past the end: count separately so pagination can recover
+                    cur.execute(_GROUP_COUNT_QUERIES[searching], search_params)
+                    total_groups = cur.fetchone()['total']
+                else:
+                    total_groups = 0
+                
                 # Create pagination info
                 base_url = url_for('membership_management')
                 pagination = create_pagination_info(
@@ -83,6 +407,10 @@ def membership_management():
                     group_sort=group_sort,
                     group_search=group_search or None
                 )
+                if pagination['has_next'] and available_groups:
+                    last = available_groups[-1]
+                    cursor = encode_page_cursor(group_sort, str(last[sort_column]), last['group_id'])
+                    pagination['page_urls'][pagination['next_num']] += f"&after={cursor}"
                 pagination_links = create_pagination_links(pagination)
             
             return render_template('group_manager/membership.html',
@@ -101,14 +429,7 @@ def membership_management():
         
         # Get selected group info
         with db.get_cursor() as cur:
-            cur.execute("""
-                SELECT g.group_id, g.name, g.group_type, g.status, g.max_members,
-                       COUNT(gm.membership_id) as current_members, g.created_at, g.is_public
-                FROM group_info g
-                LEFT JOIN group_members gm ON g.group_id = gm.group_id AND gm.status = 'active'
-                WHERE g.group_id = %s
-                GROUP BY g.group_id, g.name, g.group_type, g.status, g.max_members, g.created_at, g.is_public
-            """, (group_id,))
+            cur.execute(_SELECTED_GROUP_SQL, (group_id,))
             selected_group = cur.fetchone()
             
             if not selected_group:
@@ -116,65 +437,48 @@ def membership_management():
                 return redirect(url_for('membership_management'))
             
             # Get all groups for dropdown
-            cur.execute("""
-                SELECT g.group_id, g.name, g.group_type, g.status, g.max_members,
-                       COUNT(gm.membership_id) as current_members, g.created_at, g.is_public
-                FROM group_info g
-                LEFT JOIN group_members gm ON g.group_id = gm.group_id AND gm.status = 'active'
-                WHERE g.status = 'approved'
-                GROUP BY g.group_id, g.name, g.group_type, g.status, g.max_members, g.created_at, g.is_public
-                ORDER BY g.name
-            """)
-            available_groups = cur.fetchall()
+            available_groups = _fetch_admin_groups()
     
     elif is_group_manager():
         # Group manager can manage groups they are manager of
         with db.get_cursor() as cur:
-            # Build search condition for group managers
-            search_condition = ""
-            search_params = [user_id]
             if group_search:
-                search_condition = "AND LOWER(g.name) LIKE LOWER(%s)"
-                search_params.append(f"%{group_search}%")
-            
-            # Get all groups they manage with search
-            cur.execute(f"""
-                SELECT g.group_id, g.name, g.group_type, g.status, g.max_members,
-                       COUNT(gm.membership_id) as current_members, g.created_at, g.is_public
-                FROM group_info g
-                LEFT JOIN group_members gm ON g.group_id = gm.group_id AND gm.status = 'active'
-                JOIN group_members user_gm ON g.group_id = user_gm.group_id
-                WHERE user_gm.user_id = %s AND user_gm.group_role = 'manager' AND user_gm.status = 'active' {search_condition}
-                GROUP BY g.group_id, g.name, g.group_type, g.status, g.max_members, g.created_at, g.is_public
-                ORDER BY g.name
-            """, search_params)
-            available_groups = cur.fetchall()
+                # Get all groups they manage with search
+                cur.execute("""
+                    SELECT g.group_id, g.name, g.group_type, g.status, g.max_members,
+                           COUNT(gm.membership_id) as current_members, g.created_at, g.is_public
+                    FROM group_info g
+                    LEFT JOIN group_members gm ON g.group_id = gm.group_id AND gm.status = 'active'
+                    JOIN group_members user_gm ON g.group_id = user_gm.group_id
+                    WHERE user_gm.user_id = %s AND user_gm.group_role = 'manager' AND user_gm.status = 'active'
+                      AND LOWER(g.name) LIKE LOWER(%s)
+                    GROUP BY g.group_id, g.name, g.group_type, g.status, g.max_members, g.created_at, g.is_public
+                    ORDER BY g.name
+                """, (user_id, f"%{group_search}%"))
+                available_groups = cur.fetchall()
+            else:
+                available_groups = _fetch_manager_groups(user_id)
             
             if not available_groups:
                 flash('You are not a manager of any group.', 'error')
                 return redirect(url_for('participant_dashboard'))
             
-            # If group_id is provided, verify it's a group they manage
+            # No group_id provided: auto-select when they manage only one group,
+            # otherwise show the selection interface
+            if not group_id and len(available_groups) == 1:
+                group_id = available_groups[0]['group_id']
+            
+            # Load the selected group, verifying against the live membership
+            # rather than the (possibly cached) group list
+            selected_group = None
             if group_id:
-                selected_group = None
-                for group in available_groups:
-                    if group['group_id'] == group_id:
-                        selected_group = group
-                        break
+                cur.execute(_MANAGER_SELECTED_GROUP_SQL, (group_id, user_id))
+                selected_group = cur.fetchone()
                 
                 if not selected_group:
+                    _fetch_manager_groups.invalidate(user_id)
                     flash('You can only manage groups you are a manager of.', 'error')
                     return redirect(url_for('membership_management'))
-            else:
-                # No group_id provided, show first group or let user select
-                if len(available_groups) == 1:
-                    # Only one group, auto-select it
-                    selected_group = available_groups[0]
-                    group_id = selected_group['group_id']
-                else:
-                    # Multiple groups, show selection interface
-                    selected_group = None
-                    group_id = None
     
     else:
         flash('Access denied. You need manager or admin privileges.', 'error')
@@ -182,172 +486,54 @@ def membership_management():
     
     # Get group members with sorting
     with db.get_cursor() as cur:
-        # Build order clause for members
-        member_order_clause = "gm.group_role DESC, u.first_name, u.last_name"  # Default
-        if member_sort == 'name_asc':
-            member_order_clause = "u.first_name ASC, u.last_name ASC"
-        elif member_sort == 'name_desc':
-            member_order_clause = "u.first_name DESC, u.last_name DESC"
-        elif member_sort == 'join_date_asc':
-            member_order_clause = "gm.join_date ASC"
-        elif member_sort == 'join_date_desc':
-            member_order_clause = "gm.join_date DESC"
-        elif member_sort == 'role':
-            member_order_clause = "gm.group_role DESC, u.first_name, u.last_name"
-        elif member_sort == 'status':
-            member_order_clause = "gm.status ASC, u.first_name, u.last_name"
-        
-        cur.execute(f"""
-            SELECT gm.membership_id, gm.user_id, gm.group_role, gm.status, gm.join_date,
-                   u.username, u.first_name, u.last_name, u.email, u.user_image
-            FROM group_members gm
-            JOIN users u ON gm.user_id = u.user_id
-            WHERE gm.group_id = %s
-            ORDER BY {member_order_clause}
-        """, (group_id,))
+        # Unknown sort keys fall back to the default role ordering
+        member_sql = _MEMBER_LIST_QUERIES.get(member_sort, _MEMBER_LIST_QUERIES['role'])
+        cur.execute(member_sql, (group_id,))
         group_members = cur.fetchall()
         
-        # Get activity stats for each member separately
-        for member in group_members:
-            cur.execute("""
-                SELECT 
-                    COUNT(*) as total_events_attended,
-                    SUM(CASE WHEN em.event_role = 'volunteer' AND em.volunteer_status = 'confirmed' THEN 1 ELSE 0 END) as volunteer_events_count,
-                    MAX(e.event_date) as last_event_date
-                FROM event_members em 
-                JOIN event_info e ON em.event_id = e.event_id 
-                WHERE em.user_id = %s 
-                  AND em.participation_status IN ('registered', 'attended')
-                  AND e.event_date <= CURDATE()
-            """, (member['user_id'],))
-            stats = cur.fetchone()
-            
-            member['total_events_attended'] = stats['total_events_attended'] or 0
-            member['volunteer_events_count'] = stats['volunteer_events_count'] or 0
-            member['last_event_date'] = stats['last_event_date']
+        # Get activity stats for all members in one grouped query
+        stats_by_uid = {}
+        user_ids = tuple(member['user_id'] for member in group_members)
+        if user_ids:
+            cur.execute(_MEMBER_STATS_SQL, (user_ids,))
+            stats_by_uid = {row['user_id']: row for row in cur.fetchall()}
         
-        # Get pending requests count for display
-        cur.execute("""
-            SELECT COUNT(*) as pending_count
-            FROM group_members
-            WHERE group_id = %s AND status = 'pending'
-        """, (group_id,))
-        pending_count = cur.fetchone()['pending_count']
+        for member in group_members:
+            stats = stats_by_uid.get(member['user_id'], {})
+            member['total_events_attended'] = stats.get('total_events_attended') or 0
+            member['volunteer_events_count'] = stats.get('volunteer_events_count') or 0
+            member['last_event_date'] = stats.get('last_event_date')
         
-        # Add group statistics data (US-GM-08)
+        # Add pending requests count and group statistics data (US-GM-08);
+        # without a selected group there is nothing to count
+        pending_count = 0
         group_stats = {}
         if selected_group:
-            # Event count (total events created by this group)
-            cur.execute("""
-                SELECT COUNT(*) as count
-                FROM event_info e
-                WHERE e.group_id = %s
-            """, (group_id,))
-            event_registration_count = cur.fetchone()['count'] or 0
-            
-            # Past participants count (actual attendees - including those with race results)
-            cur.execute("""
-                SELECT COUNT(DISTINCT em.membership_id) as count
-                FROM event_members em
-                JOIN event_info e ON em.event_id = e.event_id
-                LEFT JOIN race_results rr ON em.membership_id = rr.membership_id
-                WHERE e.group_id = %s 
-                  AND e.event_date < CURDATE()
-                  AND (em.participation_status = 'attended' 
-                       OR (rr.start_time IS NOT NULL 
-                           AND rr.finish_time IS NOT NULL 
-                           AND rr.finish_time > rr.start_time))
-            """, (group_id,))
-            past_participants_count = cur.fetchone()['count'] or 0
-            
-            # Upcoming participants count (registered for future events)
-            cur.execute("""
-                SELECT COUNT(DISTINCT em.user_id) as count
-                FROM event_members em
-                JOIN event_info e ON em.event_id = e.event_id
-                WHERE e.group_id = %s AND em.participation_status = 'registered'
-                  AND e.event_date >= CURDATE() AND e.status = 'scheduled'
-            """, (group_id,))
-            upcoming_participants_count = cur.fetchone()['count'] or 0
-            
-            # Attendance count - Count users with valid race results instead of just 'attended' status
-            cur.execute("""
-                SELECT COUNT(DISTINCT em.membership_id) as count
-                FROM event_members em
-                JOIN event_info e ON em.event_id = e.event_id
-                LEFT JOIN race_results rr ON em.membership_id = rr.membership_id
-                WHERE e.group_id = %s 
-                  AND (em.participation_status = 'attended' 
-                       OR (rr.start_time IS NOT NULL 
-                           AND rr.finish_time IS NOT NULL 
-                           AND rr.finish_time > rr.start_time))
-            """, (group_id,))
-            attendance_count = cur.fetchone()['count'] or 0
-            
-            # Volunteer count - Only count confirmed volunteers from past events
-            cur.execute("""
-                SELECT COUNT(*) as count
-                FROM event_members em
-                JOIN event_info e ON em.event_id = e.event_id
-                WHERE e.group_id = %s AND em.event_role = 'volunteer' 
-                  AND em.volunteer_status = 'confirmed'
-                  AND e.event_date < CURDATE()
-            """, (group_id,))
-            volunteer_count = cur.fetchone()['count'] or 0
-            
-            # Pending volunteer count
-            cur.execute("""
-                SELECT COUNT(*) as count
-                FROM event_members em
-                JOIN event_info e ON em.event_id = e.event_id
-                WHERE e.group_id = %s AND em.event_role = 'volunteer' 
-                  AND em.volunteer_status = 'assigned'
-                  AND e.status = 'scheduled'
-                  AND e.event_date >= CURDATE()
-            """, (group_id,))
-            pending_volunteer_count = cur.fetchone()['count'] or 0
+            stats = _fetch_group_stats(group_id)
+            pending_count = stats['pending_count']
             
             # Calculate participation rate
-            cur.execute("""
-                SELECT 
-                    COUNT(DISTINCT gm.user_id) as total_members,
-                    COUNT(DISTINCT em.user_id) as participating_members
-                FROM group_members gm
-                LEFT JOIN event_members em ON gm.user_id = em.user_id
-                LEFT JOIN event_info e ON em.event_id = e.event_id AND e.group_id = gm.group_id
-                WHERE gm.group_id = %s AND gm.status = 'active'
-            """, (group_id,))
-            participation_data = cur.fetchone()
-            if participation_data['total_members'] > 0:
+            if stats['total_members'] > 0:
                 participation_rate = round(
-                    (participation_data['participating_members'] / participation_data['total_members']) * 100
+                    (stats['participating_members'] / stats['total_members']) * 100
                 )
             else:
                 participation_rate = 0
             
-            # Upcoming event count
-            cur.execute("""
-                SELECT COUNT(*) as count
-                FROM event_info e
-                WHERE e.group_id = %s AND e.status = 'scheduled'
-                  AND e.event_date >= CURDATE()
-            """, (group_id,))
-            upcoming_event_count = cur.fetchone()['count'] or 0
-            
             group_stats = {
-                'event_registration_count': event_registration_count,
-                'upcoming_event_count': upcoming_event_count,
-                'past_participants_count': past_participants_count,
-                'upcoming_participants_count': upcoming_participants_count,
-                'attendance_count': attendance_count,
-                'volunteer_count': volunteer_count,
-                'pending_volunteer_count': pending_volunteer_count,
+                'event_registration_count': stats['event_registration_count'] or 0,
+                'upcoming_event_count': stats['upcoming_event_count'] or 0,
+                'past_participants_count': stats['past_participants_count'] or 0,
+                'upcoming_participants_count': stats['upcoming_participants_count'] or 0,
+                'attendance_count': stats['attendance_count'] or 0,
+                'volunteer_count': stats['volunteer_count'] or 0,
+                'pending_volunteer_count': stats['pending_volunteer_count'] or 0,
                 'participation_rate': participation_rate
             }
     
     return render_template('group_manager/membership.html',
                          user_role=user_role,
-                         available_groups=available_groups if (is_super_admin() or is_support_technician() or is_group_manager()) else [],
+                         available_groups=available_groups,
                          selected_group=selected_group,
                          selected_group_id=group_id,
                          group_members=group_members,
@@ -363,30 +549,38 @@ def membership_management():
 @require_login
 def search_users():
     """Search users for adding to groups"""
-    query = request.args.get('q', '').strip()
+    query = request.args.get('q', '').strip().lower()
     
     if len(query) < 2:
         return jsonify({'users': []})
     
     try:
-        with db.get_cursor() as cur:
-            cur.execute("""
-                SELECT user_id, username, first_name, last_name, email
-                FROM users
-                WHERE (LOWER(username) LIKE LOWER(%s) OR LOWER(first_name) LIKE LOWER(%s) OR LOWER(last_name) LIKE LOWER(%s) OR LOWER(email) LIKE LOWER(%s))
-                  AND status = 'active'
-                ORDER BY first_name, last_name
-                LIMIT 10
-            """, (f'%{query}%', f'%{query}%', f'%{query}%', f'%{query}%'))
-            users = cur.fetchall()
-        
+        users = _search_active_users(query)
         return jsonify({'users': users})
     
-    except Exception as e:
-        print(f"Search users error: {e}")
+    except Exception:
+        logger.exception("search users failed")
         return jsonify({'users': []})
 
 
+def _check_manage_perm(group_id, own_group_message='You can only manage members in your own group.'):
+    """Return a redirect response if the current user may not manage this
+    group's members, or None if they may.
+
+    Super admins and support technicians may manage any group; a group
+    manager only a group they actively manage.
+    """
+    if is_super_admin() or is_support_technician():
+        return None
+    if is_group_manager():
+        if can_change_group_roles_in_specific_group(group_id):
+            return None
+        flash(own_group_message, 'error')
+    else:
+        flash('Access denied.', 'error')
+    return redirect(url_for('membership_management'))
+
+
 @app.route('/add-group-member', methods=['POST'])
 @require_login
 def add_group_member():
@@ -402,77 +596,59 @@ def add_group_member():
         return redirect(url_for('membership_management', group_id=group_id))
     
     # Check permissions
-    if is_super_admin() or is_support_technician():
-        # Super admin and support technician can add to any group
-        pass
-    elif is_group_manager():
-        # Group manager can only add to their own group
-        if not can_change_group_roles_in_specific_group(group_id):
-            flash('You can only manage members in your own group.', 'error')
-            return redirect(url_for('membership_management'))
-    else:
-        flash('Access denied.', 'error')
-        return redirect(url_for('membership_management'))
+    denied = _check_manage_perm(group_id)
+    if denied:
+        return denied
     
     try:
-        with db.get_cursor() as cur:
-            # Check if group exists and get info
+        with db.transaction() as cur:
+            # One guard query for the group, the user, any existing membership and
+            # the capacity. Locking the group row serialises concurrent adds to the
+            # same group, so the capacity check still holds at INSERT time.
             cur.execute("""
-                SELECT name, max_members, status
-                FROM group_info
-                WHERE group_id = %s
-            """, (group_id,))
-            group_info = cur.fetchone()
+                SELECT g.name, g.max_members, g.status,
+                       u.user_id AS member_user_id, u.username, u.first_name, u.last_name,
+                       u.status AS user_status,
+                       gm.status AS existing_status,
+                       (SELECT COUNT(*)
+                        FROM group_members
+                        WHERE group_id = g.group_id AND status = 'active') AS current_count
+                FROM group_info g
+                LEFT JOIN users u ON u.user_id = %s
+                LEFT JOIN group_members gm ON gm.user_id = u.user_id AND gm.group_id = g.group_id
+                WHERE g.group_id = %s
+                FOR UPDATE OF g
+            """, (member_user_id, group_id))
+            guard = cur.fetchone()
             
-            if not group_info:
+            if not guard:
                 flash('Group not found.', 'error')
                 return redirect(url_for('membership_management'))
             
-            if group_info['status'] != 'approved':
+            if guard['status'] != 'approved':
                 flash('Cannot add members to inactive groups.', 'error')
                 return redirect(url_for('membership_management', group_id=group_id))
             
             # Check if user exists and is active
-            cur.execute("""
-                SELECT username, first_name, last_name, status
-                FROM users
-                WHERE user_id = %s
-            """, (member_user_id,))
-            user_info = cur.fetchone()
-            
-            if not user_info:
+            if guard['member_user_id'] is None:
                 flash('User not found.', 'error')
                 return redirect(url_for('membership_management', group_id=group_id))
             
-            if user_info['status'] != 'active':
+            if guard['user_status'] != 'active':
                 flash('Cannot add inactive users to groups.', 'error')
                 return redirect(url_for('membership_management', group_id=group_id))
             
             # Check if user is already a member
-            cur.execute("""
-                SELECT status
-                FROM group_members
-                WHERE user_id = %s AND group_id = %s
-            """, (member_user_id, group_id))
-            existing_membership = cur.fetchone()
-            
-            if existing_membership:
-                if existing_membership['status'] == 'active':
-                    flash(f'{user_info["first_name"]} {user_info["last_name"]} is already a member of this group.', 'warning')
+            if guard['existing_status']:
+                if guard['existing_status'] == 'active':
+                    flash(f'{guard["first_name"]} {guard["last_name"]} is already a member of this group.', 'warning')
                 else:
-                    flash(f'{user_info["first_name"]} {user_info["last_name"]} has a pending membership request.', 'info')
+                    flash(f'{guard["first_name"]} {guard["last_name"]} has a pending membership request.', 'info')
                 return redirect(url_for('membership_management', group_id=group_id))
             
             # Check group capacity
-            cur.execute("""
-                SELECT COUNT(*) as current_count
-                FROM group_members
-                WHERE group_id = %s AND status = 'active'
-            """, (group_id,))
-            current_count = cur.fetchone()['current_count']
-            
-            if current_count >= group_info['max_members']:
-                flash(f'Group has reached maximum capacity ({group_info["max_members"]} members).', 'error')
+            if guard['current_count'] >= guard['max_members']:
+                flash(f'Group has reached maximum capacity ({guard["max_members"]} members).', 'error')
                 return redirect(url_for('membership_management', group_id=group_id))
             
             # Add member
@@ -481,28 +657,25 @@ def add_group_member():
                 VALUES (%s, %s, %s, 'active')
             """, (member_user_id, group_id, member_role))
             
-            # Send notification to the new member
-            noti.create_noti(
-                user_id=member_user_id,
-                title='Added to Group',
-                message=f'You have been added to the group "{group_info["name"]}" as a {member_role}.',
-                category='group',
-                related_id=group_id
-            )
-            
-            # Send notification to the person who added the member (admin/manager)
-            noti.create_noti(
-                user_id=user_id,
-                title='Member Added Successfully',
-                message=f'Successfully added {user_info["first_name"]} {user_info["last_name"]} to "{group_info["name"]}" as {member_role}.',
-                category='group',
-                related_id=group_id
-            )
-            
-            flash(f'Successfully added {user_info["first_name"]} {user_info["last_name"]} to the group as {member_role}.', 'success')
+            # Notify the new member and the person who added them (admin/manager)
+            noti.create_notis([
+                (member_user_id, 'Added to Group',
+                 f'You have been added to the group "{guard["name"]}" as a {member_role}.',
+                 'group', group_id),
+                (user_id, 'Member Added Successfully',
+                 f'Successfully added {guard["first_name"]} {guard["last_name"]} to "{guard["name"]}" as {member_role}.',
+                 'group', group_id),
+            ])
+            
+            flash(f'Successfully added {guard["first_name"]} {guard["last_name"]} to the group as {member_role}.', 'success')
+
+        # Only once the new member has been committed
+        invalidate_membership_caches(group_id)
+        if member_role == 'manager':
+            get_group_manager_ids.invalidate(group_id)
     
-    except Exception as e:
-        print(f"Add group member error: {e}")
+    except Exception:
+        logger.exception("add group member failed")
         flash('An error occurred while adding the member.', 'error')
     
     return redirect(url_for('membership_management', group_id=group_id))
@@ -522,24 +695,17 @@ def change_member_role():
         return redirect(url_for('membership_management', group_id=group_id))
     
     # Check permissions
-    if is_super_admin():
-        # Super admin can change roles in any group
-        pass
-    elif is_support_technician():
+    super_admin = is_super_admin()
+    if is_support_technician():
         # Support technician cannot change group roles
         flash('You do not have permission to change group roles.', 'warning')
         return redirect(url_for('membership_management', group_id=group_id))
-    elif is_group_manager():
-        # Group manager can only change roles in their own group
-        if not can_change_group_roles_in_specific_group(group_id):
-            flash('You can only manage members in your own group.', 'error')
-            return redirect(url_for('membership_management'))
-    else:
-        flash('Access denied.', 'error')
-        return redirect(url_for('membership_management'))
+    denied = _check_manage_perm(group_id)
+    if denied:
+        return denied
     
     try:
-        with db.get_cursor() as cur:
+        with db.transaction() as cur:
             # Get current membership info
             cur.execute("""
                 SELECT gm.user_id, gm.group_role, u.username, u.first_name, u.last_name, g.name as group_name
@@ -564,32 +730,41 @@ def change_member_role():
             
             # If changing the last manager to non-manager role, handle auto-promotion
             if membership['group_role'] == 'manager' and manager_count <= 1 and new_role != 'manager':
-                if is_super_admin():
+                if super_admin:
                     # Super admin can change last manager role, but auto-promote another member
+                    # (pick and promote in one statement so nobody can slip in between)
                     cur.execute("""
-                        SELECT gm.membership_id, gm.user_id, u.username, u.first_name, u.last_name
-                        FROM group_members gm
-                        JOIN users u ON gm.user_id = u.user_id
-                        WHERE gm.group_id = %s AND gm.group_role != 'manager' AND gm.status = 'active'
-                        ORDER BY 
-                            CASE gm.group_role 
-                                WHEN 'volunteer' THEN 1 
-                                WHEN 'member' THEN 2 
-                                ELSE 3 
-                            END,
-                            gm.join_date ASC
-                        LIMIT 1
+                        UPDATE group_members gm
+                        JOIN (
+                            SELECT membership_id
+                            FROM group_members
+                            WHERE group_id = %s AND group_role != 'manager' AND status = 'active'
+                            ORDER BY 
+                                CASE group_role 
+                                    WHEN 'volunteer' THEN 1 
+                                    WHEN 'member' THEN 2 
+                                    ELSE 3 
+                                END,
+                                join_date ASC
+                            LIMIT 1
+                        ) pick ON gm.membership_id = pick.membership_id
+                        SET gm.group_role = 'manager'
                     """, (group_id,))
-                    next_manager = cur.fetchone()
                     
-                    if next_manager:
-                        # Promote the next member to manager
+                    next_manager = None
+                    if cur.rowcount:
+                        # The promoted member is now the only other manager in the group
                         cur.execute("""
-                            UPDATE group_members
-                            SET group_role = 'manager'
-                            WHERE membership_id = %s
-                        """, (next_manager['membership_id'],))
-                        
+                            SELECT gm.user_id, u.username, u.first_name, u.last_name
+                            FROM group_members gm
+                            JOIN users u ON gm.user_id = u.user_id
+                            WHERE gm.group_id = %s AND gm.group_role = 'manager' AND gm.status = 'active'
+                              AND gm.membership_id != %s
+                            LIMIT 1
+                        """, (group_id, membership_id))
+                        next_manager = cur.fetchone()
+                    
+                    if next_manager:
                         # Send notification to the new manager
                         noti.create_noti(
                             user_id=next_manager['user_id'],
@@ -615,28 +790,24 @@ def change_member_role():
                 WHERE membership_id = %s
             """, (new_role, membership_id))
             
-            # Send notification to the member whose role was changed
-            noti.create_noti(
-                user_id=membership['user_id'],
-                title='Role Changed',
-                message=f'Your role in "{membership["group_name"]}" has been changed to {new_role}.',
-                category='group',
-                related_id=group_id
-            )
-            
-            # Send notification to the person who changed the role (admin/manager)
-            noti.create_noti(
-                user_id=user_id,
-                title='Member Role Changed Successfully',
-                message=f'Successfully changed {membership["first_name"]} {membership["last_name"]}\'s role to {new_role} in "{membership["group_name"]}".',
-                category='group',
-                related_id=group_id
-            )
+            # Notify the member whose role was changed and the person who changed it (admin/manager)
+            noti.create_notis([
+                (membership['user_id'], 'Role Changed',
+                 f'Your role in "{membership["group_name"]}" has been changed to {new_role}.',
+                 'group', group_id),
+                (user_id, 'Member Role Changed Successfully',
+                 f'Successfully changed {membership["first_name"]} {membership["last_name"]}\'s role to {new_role} in "{membership["group_name"]}".',
+                 'group', group_id),
+            ])
             
             flash(f'Successfully changed {membership["first_name"]} {membership["last_name"]}\'s role to {new_role}.', 'success')
+
+        # Only once the role change has been committed
+        get_group_manager_ids.invalidate(group_id)
+        invalidate_membership_caches(group_id)
     
-    except Exception as e:
-        print(f"Change member role error: {e}")
+    except Exception:
+        logger.exception("change member role failed")
         flash('An error occurred while changing the role.', 'error')
     
     return redirect(url_for('membership_management', group_id=group_id))
@@ -655,23 +826,19 @@ def remove_group_member():
         return redirect(url_for('membership_management', group_id=group_id))
     
     # Check permissions
-    if is_super_admin() or is_support_technician():
-        # Super admin and support technician can remove from any group
-        pass
-    elif is_group_manager():
-        # Group manager can only remove from their own group
-        if not can_change_group_roles_in_specific_group(group_id):
-            flash('You can only manage members in your own group.', 'error')
-            return redirect(url_for('membership_management'))
-    else:
-        flash('Access denied.', 'error')
-        return redirect(url_for('membership_management'))
+    super_admin = is_super_admin()
+    denied = _check_manage_perm(group_id)
+    if denied:
+        return denied
     
     try:
-        with db.get_cursor() as cur:
-            # Get membership info
+        with db.transaction() as cur:
+            # Get membership info and the group's active manager count
             cur.execute("""
-                SELECT gm.user_id, gm.group_role, u.username, u.first_name, u.last_name, g.name as group_name
+                SELECT gm.user_id, gm.group_role, u.username, u.first_name, u.last_name, g.name as group_name,
+                       (SELECT COUNT(*)
+                        FROM group_members
+                        WHERE group_id = gm.group_id AND group_role = 'manager' AND status = 'active') as manager_count
                 FROM group_members gm
                 JOIN users u ON gm.user_id = u.user_id
                 JOIN group_info g ON gm.group_id = g.group_id
@@ -683,50 +850,50 @@ def remove_group_member():
                 flash('Membership not found.', 'error')
                 return redirect(url_for('membership_management', group_id=group_id))
             
-            # Check if this is the last manager
-            cur.execute("""
-                SELECT COUNT(*) as manager_count
-                FROM group_members
-                WHERE group_id = %s AND group_role = 'manager' AND status = 'active'
-            """, (group_id,))
-            manager_count = cur.fetchone()['manager_count']
+            full_name = f'{membership["first_name"]} {membership["last_name"]}'
+            gname = membership['group_name']
+            
+            # Notifications are collected and written with one INSERT at the end
+            notis = []
             
             # If removing the last manager, handle auto-promotion
-            if membership['group_role'] == 'manager' and manager_count <= 1:
-                if is_super_admin():
+            if membership['group_role'] == 'manager' and membership['manager_count'] <= 1:
+                if super_admin:
                     # Super admin can remove last manager, but auto-promote another member
+                    # (pick and promote in one statement so nobody can slip in between)
                     cur.execute("""
-                        SELECT gm.membership_id, gm.user_id, u.username, u.first_name, u.last_name
-                        FROM group_members gm
-                        JOIN users u ON gm.user_id = u.user_id
-                        WHERE gm.group_id = %s AND gm.group_role != 'manager' AND gm.status = 'active'
+                        UPDATE group_members
+                        SET group_role = 'manager'
+                        WHERE group_id = %s AND group_role != 'manager' AND status = 'active'
                         ORDER BY 
-                            CASE gm.group_role 
+                            CASE group_role 
                                 WHEN 'volunteer' THEN 1 
                                 WHEN 'member' THEN 2 
                                 ELSE 3 
                             END,
-                            gm.join_date ASC
+                            join_date ASC
                         LIMIT 1
                     """, (group_id,))
-                    next_manager = cur.fetchone()
                     
-                    if next_manager:
-                        # Promote the next member to manager
+                    next_manager = None
+                    if cur.rowcount:
+                        # The promoted member is now the only other manager in the group
                         cur.execute("""
-                            UPDATE group_members
-                            SET group_role = 'manager'
-                            WHERE membership_id = %s
-                        """, (next_manager['membership_id'],))
-                        
-                        # Send notification to the new manager
-                        noti.create_noti(
-                            user_id=next_manager['user_id'],
-                            title='Promoted to Group Manager',
-                            message=f'You have been automatically promoted to manager of "{membership["group_name"]}" as the previous manager was removed.',
-                            category='group',
-                            related_id=group_id
-                        )
+                            SELECT gm.user_id, u.username, u.first_name, u.last_name
+                            FROM group_members gm
+                            JOIN users u ON gm.user_id = u.user_id
+                            WHERE gm.group_id = %s AND gm.group_role = 'manager' AND gm.status = 'active'
+                              AND gm.membership_id != %s
+                            LIMIT 1
+                        """, (group_id, membership_id))
+                        next_manager = cur.fetchone()
+                    
+                    if next_manager:
+                        # Notify the new manager
+                        notis.append((
+                            next_manager['user_id'], 'Promoted to Group Manager',
+                            f'You have been automatically promoted to manager of "{gname}" as the previous manager was removed.',
+                            'group', group_id))
                         
                         flash(f'Last manager removed. {next_manager["first_name"]} {next_manager["last_name"]} has been automatically promoted to manager.', 'info')
                     else:
@@ -750,28 +917,24 @@ def remove_group_member():
                 WHERE em.user_id = %s AND e.group_id = %s
             """, (membership['user_id'], group_id))
             
-            # Send notification to the removed member
-            noti.create_noti(
-                user_id=membership['user_id'],
-                title='Removed from Group',
-                message=f'You have been removed from the group "{membership["group_name"]}". You are also automatically unregistered from all events of this group.',
-                category='group',
-                related_id=group_id
-            )
-            
-            # Send notification to the person who removed the member (admin/manager)
-            noti.create_noti(
-                user_id=user_id,
-                title='Member Removed Successfully',
-                message=f'Successfully removed {membership["first_name"]} {membership["last_name"]} from "{membership["group_name"]}".',
-                category='group',
-                related_id=group_id
-            )
-            
-            flash(f'Successfully removed {membership["first_name"]} {membership["last_name"]} from the group.', 'success')
+            # Notify the removed member and the person who removed them (admin/manager)
+            notis.append((
+                membership['user_id'], 'Removed from Group',
+                f'You have been removed from the group "{gname}". You are also automatically unregistered from all events of this group.',
+                'group', group_id))
+            notis.append((
+                user_id, 'Member Removed Successfully',
+                f'Successfully removed {full_name} from "{gname}".',
+                'group', group_id))
+        
+        # Sent only once the removal has been committed
+        get_group_manager_ids.invalidate(group_id)
+        invalidate_membership_caches(group_id)
+        noti.enqueue_rows(notis)
+        flash(f'Successfully removed {full_name} from the group.', 'success')
     
-    except Exception as e:
-        print(f"Remove group member error: {e}")
+    except Exception:
+        logger.exception("remove group member failed")
         flash('An error occurred while removing the member.', 'error')
     
     return redirect(url_for('membership_management', group_id=group_id))
@@ -790,25 +953,21 @@ def approve_group_request():
         return redirect(url_for('membership_management', group_id=group_id))
     
     # Check permissions
-    if is_super_admin() or is_support_technician():
-        # Super admin and support technician can approve requests for any group
-        pass
-    elif is_group_manager():
-        # Group manager can only approve requests for their own group
-        if not can_change_group_roles_in_specific_group(group_id):
-            flash('You can only manage requests for your own group.', 'error')
-            return redirect(url_for('membership_management'))
-    else:
-        flash('Access denied.', 'error')
-        return redirect(url_for('membership_management'))
+    denied = _check_manage_perm(group_id, 'You can only manage requests for your own group.')
+    if denied:
+        return denied
     
     try:
-        with db.get_cursor() as cur:
-            # Get membership info (without pending_event_id from database)
+        with db.transaction() as cur:
+            # Get membership info and the group's active member count
+            # (without pending_event_id from database)
             cur.execute("""
                 SELECT gm.user_id, gm.status, 
                        u.username, u.first_name, u.last_name, 
-                       g.name as group_name, g.max_members
+                       g.name as group_name, g.max_members,
+                       (SELECT COUNT(*)
+                        FROM group_members
+                        WHERE group_id = gm.group_id AND status = 'active') as current_count
                 FROM group_members gm
                 JOIN users u ON gm.user_id = u.user_id
                 JOIN group_info g ON gm.group_id = g.group_id
@@ -824,15 +983,11 @@ def approve_group_request():
                 flash('This request is not pending.', 'warning')
                 return redirect(url_for('membership_management', group_id=group_id))
             
-            # Check group capacity
-            cur.execute("""
-                SELECT COUNT(*) as current_count
-                FROM group_members
-                WHERE group_id = %s AND status = 'active'
-            """, (group_id,))
-            current_count = cur.fetchone()['current_count']
+            full_name = f'{membership["first_name"]} {membership["last_name"]}'
+            gname = membership['group_name']
             
-            if current_count >= membership['max_members']:
+            # Check group capacity
+            if membership['current_count'] >= membership['max_members']:
                 flash(f'Group has reached maximum capacity ({membership["max_members"]} members).', 'error')
                 return redirect(url_for('membership_management', group_id=group_id))
             
@@ -843,23 +998,16 @@ def approve_group_request():
                 WHERE membership_id = %s
             """, (membership_id,))
             
-            # Send notification to the approved member
-            noti.create_noti(
-                user_id=membership['user_id'],
-                title='Group Request Approved',
-                message=f'Your request to join "{membership["group_name"]}" has been approved! You are now a member of the group.',
-                category='group',
-                related_id=group_id
-            )
-            
-            # Send notification to the approver
-            noti.create_noti(
-                user_id=user_id,
-                title='Request Approved',
-                message=f'Successfully approved {membership["first_name"]} {membership["last_name"]}\'s request to join "{membership["group_name"]}".',
-                category='group',
-                related_id=group_id
-            )
+            # Notify the approved member and the approver
+            # (collected and written with one INSERT at the end)
+            notis = [
+                (membership['user_id'], 'Group Request Approved',
+                 f'Your request to join "{gname}" has been approved! You are now a member of the group.',
+                 'group', group_id),
+                (user_id, 'Request Approved',
+                 f'Successfully approved {full_name}\'s request to join "{gname}".',
+                 'group', group_id),
+            ]
             
             # Check if the approved user has a pending event registration for this group
             approved_user_id = membership['user_id']
@@ -877,62 +1025,24 @@ def approve_group_request():
             
             pending_event_id = None
             if pending_notification:
-                message = pending_notification['message']
-                if 'event_id:' in message:
-                    try:
-                        event_id_part = message.split('event_id:')[1].split('|')[0]
-                        pending_event_id = int(event_id_part)
-                    except (ValueError, IndexError):
-                        pass
-            
-            target_event = None
-            
-            # First, try to use the pending_event_id if it exists
-            if pending_event_id:
-                cur.execute("""
-                    SELECT e.event_id, e.event_title, e.max_participants,
-                           COUNT(em.membership_id) as registered_count
-                    FROM event_info e
-                    LEFT JOIN event_members em ON e.event_id = em.event_id 
-                        AND em.participation_status IN ('registered', 'attended')
-                    WHERE e.event_id = %s AND e.group_id = %s AND e.status = 'scheduled'
-                        AND e.event_date >= CURDATE()
-                    GROUP BY e.event_id, e.event_title, e.max_participants, e.event_date
-                """, (pending_event_id, group_id))
-                target_event = cur.fetchone()
+                m = _EVENT_ID_RE.search(pending_notification['message'])
+                pending_event_id = int(m.group(1)) if m else None
             
-            # If no pending event or it's not valid, fall back to the most recent upcoming event
-            if not target_event:
-                cur.execute("""
-                    SELECT e.event_id, e.event_title, e.max_participants,
-                           COUNT(em.membership_id) as registered_count
-                    FROM event_info e
-                    LEFT JOIN event_members em ON e.event_id = em.event_id 
-                        AND em.participation_status IN ('registered', 'attended')
-                    WHERE e.group_id = %s AND e.status = 'scheduled'
-                        AND e.event_date >= CURDATE()
-                    GROUP BY e.event_id, e.event_title, e.max_participants, e.event_date
-                    ORDER BY e.event_date ASC
-                    LIMIT 1
-                """, (group_id,))
-                target_event = cur.fetchone()
+            # Use the pending event if it is still valid, otherwise fall back to the
+            # most recent upcoming event (a NULL event_id never matches the first branch)
+            cur.execute(_TARGET_EVENT_SQL, {'event_id': pending_event_id, 'group_id': group_id})
+            target_event = cur.fetchone()
             
             # Auto-register for the target event if available and not full
             if target_event and target_event['registered_count'] < target_event['max_participants']:
-                # Check if user is already registered for this event
+                # Register user for the event; uniq_user_event makes this a no-op
+                # (rowcount 0) when they are already registered
                 cur.execute("""
-                    SELECT 1 FROM event_members 
-                    WHERE user_id = %s AND event_id = %s
-                """, (approved_user_id, target_event['event_id']))
+                    INSERT IGNORE INTO event_members (event_id, user_id, event_role, participation_status)
+                    VALUES (%s, %s, 'participant', 'registered')
+                """, (target_event['event_id'], approved_user_id))
                 
-                existing_registration = cur.fetchone()
-                if not existing_registration:
-                    # Register user for the event
-                    cur.execute("""
-                        INSERT INTO event_members (event_id, user_id, event_role, participation_status)
-                        VALUES (%s, %s, 'participant', 'registered')
-                    """, (target_event['event_id'], approved_user_id))
-                    
+                if cur.rowcount:
                     # Clear the pending event notification
                     cur.execute("""
                         DELETE FROM notifications
@@ -940,18 +1050,19 @@ def approve_group_request():
                           AND category = 'system' AND related_id = %s
                     """, (approved_user_id, group_id))
                     
-                    # Send notification about auto event registration
-                    noti.create_noti(
-                        user_id=approved_user_id,
-                        title='Auto-Registered for Event',
-                        message=f'You have been automatically registered for "{target_event["event_title"]}" after joining "{membership["group_name"]}".',
-                        category='event',
-                        related_id=target_event['event_id']
-                    )
-            
-            flash(f'Successfully approved {membership["first_name"]} {membership["last_name"]}\'s request to join the group.', 'success')
+                    # Notify about auto event registration
+                    notis.append((
+                        approved_user_id, 'Auto-Registered for Event',
+                        f'You have been automatically registered for "{target_event["event_title"]}" after joining "{gname}".',
+                        'event', target_event['event_id']))
+        
+        # Sent only once the approval has been committed
+        invalidate_membership_caches(group_id)
+        noti.enqueue_rows(notis)
+        flash(f'Successfully approved {full_name}\'s request to join the group.', 'success')
     
-    except Exception as e:
+    except Exception:
+        logger.exception("approve group request failed")
         flash('An error occurred while approving the request.', 'error')
     
     return redirect(url_for('membership_management', group_id=group_id))
@@ -971,20 +1082,12 @@ def reject_group_request():
         return redirect(url_for('membership_management', group_id=group_id))
     
     # Check permissions
-    if is_super_admin() or is_support_technician():
-        # Super admin and support technician can reject requests for any group
-        pass
-    elif is_group_manager():
-        # Group manager can only reject requests for their own group
-        if not can_change_group_roles_in_specific_group(group_id):
-            flash('You can only manage requests for your own group.', 'error')
-            return redirect(url_for('membership_management'))
-    else:
-        flash('Access denied.', 'error')
-        return redirect(url_for('membership_management'))
+    denied = _check_manage_perm(group_id, 'You can only manage requests for your own group.')
+    if denied:
+        return denied
     
     try:
-        with db.get_cursor() as cur:
+        with db.transaction() as cur:
             # Get membership info
             cur.execute("""
                 SELECT gm.user_id, gm.status, u.username, u.first_name, u.last_name, g.name as group_name
@@ -1003,6 +1106,9 @@ def reject_group_request():
                 flash('This request is not pending.', 'warning')
                 return redirect(url_for('membership_management', group_id=group_id))
             
+            full_name = f'{membership["first_name"]} {membership["last_name"]}'
+            gname = membership['group_name']
+            
             # Store rejection reason before removing the membership request
             if reason:
                 # Validate the rejection reason is a valid ENUM value
@@ -1026,28 +1132,23 @@ def reject_group_request():
                 WHERE membership_id = %s
             """, (membership_id,))
             
-            # Send notification to the rejected member without reason
-            noti.create_noti(
-                user_id=membership['user_id'],
-                title='Group Request Rejected',
-                message=f'Your request to join "{membership["group_name"]}" has been rejected. Please contact support for more information.',
-                category='group',
-                related_id=group_id
-            )
-            
-            # Send notification to the rejector
-            noti.create_noti(
-                user_id=user_id,
-                title='Request Rejected',
-                message=f'Successfully rejected {membership["first_name"]} {membership["last_name"]}\'s request to join "{membership["group_name"]}".',
-                category='group',
-                related_id=group_id
-            )
-            
-            flash(f'Successfully rejected {membership["first_name"]} {membership["last_name"]}\'s request to join the group.', 'success')
+            # Notify the rejected member (without reason) and the rejector
+            notis = [
+                (membership['user_id'], 'Group Request Rejected',
+                 f'Your request to join "{gname}" has been rejected. Please contact support for more information.',
+                 'group', group_id),
+                (user_id, 'Request Rejected',
+                 f'Successfully rejected {full_name}\'s request to join "{gname}".',
+                 'group', group_id),
+            ]
+        
+        # Sent only once the rejection has been committed
+        invalidate_membership_caches(group_id)
+        noti.enqueue_rows(notis)
+        flash(f'Successfully rejected {full_name}\'s request to join the group.', 'success')
     
-    except Exception as e:
-        print(f"Reject group request error: {e}")
+    except Exception:
+        logger.exception("reject group request failed")
         flash('An error occurred while rejecting the request.', 'error')
     
     return redirect(url_for('membership_management', group_id=group_id))
\ No newline at end of file
@@ -1,8 +1,15 @@
+import logging
+import MySQLdb
 from eventbridge_plus import app, noti, db
 from flask import render_template, request, jsonify, session, flash, redirect, url_for
-from .auth import require_login, require_platform_role, get_current_user_id
+from .auth import (require_login, require_platform_role, get_current_user_id, get_group_manager_ids,
+                   is_super_admin, is_support_technician)
+from .group_manager import invalidate_membership_caches
+from .util import ttl_cache, FULLTEXT_OPERATORS
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 # ---- Configuration and constants ----
 try:
     from .validation import AVAILABLE_LOCATIONS
@@ -11,6 +18,10 @@ except Exception:
 
 GROUP_TYPES = ['activity', 'social', 'mixed']
 
+# Set forms of the lists, for validation; the lists keep their order for templates
+GROUP_TYPES_SET = frozenset(GROUP_TYPES)
+AVAILABLE_LOCATIONS_SET = frozenset(AVAILABLE_LOCATIONS)
+
 
 # ---- Utility function ----
 def _current_user_id():
@@ -35,59 +46,227 @@ def _current_user_id():
         return row['user_id'] if row else None
 
 
-def _active_member_count(group_id: int) -> int:
-    """Count the current number of active members in the group"""
-    with db.get_cursor() as cur:
-        cur.execute(
-            "SELECT COUNT(*) AS c FROM group_members WHERE group_id=%s AND status='active'",
-            (group_id,),
-        )
-        row = cur.fetchone() or {}
-        return row.get('c', 0)
+# Every (table, column) pair in the app's schema, loaded by one query on first
+# use; the schema does not change while the process runs
+_schema_columns = None
 
 
 def _has_column(table: str, column: str) -> bool:
     """Check if a column exists in the database (to avoid 500 errors caused by schema inconsistency)"""
-    try:
-        with db.get_cursor() as cur:
-            cur.execute(f"SHOW COLUMNS FROM {table} LIKE %s", (column,))
-            return cur.fetchone() is not None
-    except Exception:
-        return False
+    global _schema_columns
+    if _schema_columns is None:
+        try:
+            with db.get_cursor() as cur:
+                cur.execute("""
+                    SELECT table_name AS t, column_name AS c
+                    FROM information_schema.columns
+                    WHERE table_schema = DATABASE()
+                """)
+                _schema_columns = {(r['t'].lower(), r['c'].lower()) for r in cur.fetchall()}
+        except Exception:
+            # Not cached, so a transient error is retried on the next call
+            return False
+    return (table.lower(), column.lower()) in _schema_columns
 
 
 HAS_LOCATION = True  # group_location column exists in group_info table
 LOC_SELECT = "group_location" if HAS_LOCATION else "NULL"
 
+
+def _loc_params(location):
+    """The group_location parameter, if the statement has that column."""
+    return (location,) if HAS_LOCATION else ()
+
+
+# ----- group_apply_for_participant statements -----
+# HAS_LOCATION is fixed for the life of the process, so each statement is
+# formatted once here. MySQL applies UPDATE assignments left to right, so
+# rejection_reason is cleared when the new status is 'pending'.
+_APPLY_UPDATE_SQL = f"""
+    UPDATE group_info
+       SET name=%s, description=%s, {'group_location=%s, ' if HAS_LOCATION else ''}group_type=%s,
+           is_public=%s, max_members=%s, status=%s,
+           rejection_reason=IF(status='pending', NULL, rejection_reason)
+     WHERE group_id=%s
+"""
+
+_APPLY_INSERT_SQL = f"""
+    INSERT INTO group_info
+      (name, description, {'group_location, ' if HAS_LOCATION else ''}group_type, is_public, max_members, status, created_by)
+    VALUES (%s, %s, {'%s, ' if HAS_LOCATION else ''}%s, %s, %s, %s, %s)
+"""
+
+# Admin-created group, approved immediately
+_CREATE_GROUP_SQL = f"""
+    INSERT INTO group_info
+        (name, description, {'group_location, ' if HAS_LOCATION else ''}group_type, is_public, max_members,
+         first_members, status, created_by)
+    VALUES (%s, %s, {'%s, ' if HAS_LOCATION else ''}%s, %s, %s, %s, 'approved', %s)
+"""
+
+# Admin edit page: the group, its members and its pending requests as three
+# statements sent together (mysqlclient enables multi-statement queries by
+# default); read with nextset()
+_GROUP_EDIT_GROUP_SQL = (
+    "SELECT * FROM group_info WHERE group_id=%s" if HAS_LOCATION else """
+    SELECT
+        group_id, name, description, NULL AS location,
+        group_type, is_public, max_members, status,
+        first_members, created_by, created_at, updated_at
+    FROM group_info
+    WHERE group_id=%s"""
+)
+
+_GROUP_EDIT_SQL = f"""
+    {_GROUP_EDIT_GROUP_SQL};
+    SELECT gm.membership_id, gm.user_id, u.username, gm.group_role, gm.status, gm.join_date
+    FROM group_members gm
+    JOIN users u ON gm.user_id = u.user_id
+    WHERE gm.group_id=%s
+    ORDER BY u.username;
+    SELECT r.request_id, r.user_id, u.username, r.message, r.requested_at
+    FROM group_requests r
+    JOIN users u ON u.user_id = r.user_id
+    WHERE r.group_id=%s AND r.status='pending'
+    ORDER BY r.requested_at ASC
+"""
+
+# Most recent rejected/draft application to pre-fill the form (rejected first).
+# One leg per status, each a backwards scan of idx_created_by_status_updated
+# (updated_at is NOT NULL, so it is the last-change time on its own); the
+# outer sort only ever sees the two picked rows.
+_APPLY_PREFILL_LEG = f"""
+    SELECT group_id, name, description, {LOC_SELECT} AS location,
+           group_type, is_public, max_members, status, rejection_reason,
+           updated_at AS ts, {{pri}} AS pri
+      FROM group_info
+     WHERE created_by=%(uid)s AND status={{status}}
+     ORDER BY updated_at DESC
+     LIMIT 1
+"""
+
+_APPLY_PREFILL_SQL = (
+    "(" + _APPLY_PREFILL_LEG.format(status="'rejected'", pri=0) + ")\n"
+    "UNION ALL\n"
+    "(" + _APPLY_PREFILL_LEG.format(status="'draft'", pri=1) + ")\n"
+    "ORDER BY pri\n"
+    "LIMIT 1"
+)
+
+# ----- group_detail queries -----
+# Group info with manager; the counts are scalar subqueries so members and
+# events are never joined against each other
+_GROUP_DETAIL_SQL = f"""
+    SELECT 
+        g.group_id, g.name, g.description, {LOC_SELECT} AS location,
+        g.group_type, g.is_public, g.max_members, g.status,
+        g.created_at,
+        (SELECT COUNT(*)
+         FROM group_members
+         WHERE group_id = g.group_id AND status = 'active') AS member_count,
+        (SELECT COUNT(*)
+         FROM event_info
+         WHERE group_id = g.group_id AND status = 'scheduled'
+           AND event_date >= CURDATE()) AS upcoming_events_count,
+        manager.username as manager_username,
+        manager.platform_role as manager_platform_role
+    FROM group_info g
+    LEFT JOIN group_members gm_manager ON g.group_id = gm_manager.group_id 
+        AND gm_manager.group_role = 'manager' AND gm_manager.status = 'active'
+    LEFT JOIN users manager ON gm_manager.user_id = manager.user_id
+    WHERE g.group_id = %s
+    LIMIT 1
+"""
+
+# Upcoming events with the viewer's registration. Registrations are counted
+# once per event in the derived table, and the viewer's own registration is a
+# single-row join on uniq_user_event (user_id is NULL when not logged in, so
+# the user columns come back NULL)
+_GROUP_EVENTS_SQL = """
+    SELECT 
+        e.event_id, e.event_title, e.event_type,
+        e.event_date, e.event_time, e.location,
+        e.max_participants,
+        COALESCE(rc.registered_count, 0) AS registered_count,
+        e.max_participants - COALESCE(rc.registered_count, 0) AS spots_available,
+        COALESCE(rc.registered_count, 0) >= e.max_participants AS is_full,
+        ue.event_role AS user_event_role,
+        ue.participation_status AS user_participation_status,
+        ue.membership_id IS NOT NULL AS is_registered
+    FROM event_info e
+    LEFT JOIN (
+        SELECT em.event_id, COUNT(*) AS registered_count
+        FROM event_members em
+        JOIN event_info re ON re.event_id = em.event_id
+        WHERE re.group_id = %s
+            AND re.status = 'scheduled'
+            AND re.event_date >= CURDATE()
+            AND em.participation_status IN ('registered', 'attended')
+            AND (em.event_role != 'volunteer' OR em.volunteer_status IS NULL OR em.volunteer_status != 'cancelled')
+        GROUP BY em.event_id
+    ) rc ON rc.event_id = e.event_id
+    LEFT JOIN event_members ue ON ue.event_id = e.event_id
+        AND ue.user_id = %s
+        AND ue.participation_status IN ('registered', 'attended')
+        AND (ue.event_role != 'volunteer' OR ue.volunteer_status IS NULL OR ue.volunteer_status != 'cancelled')
+    WHERE e.group_id = %s
+        AND e.status = 'scheduled'
+        AND e.event_date >= CURDATE()
+    ORDER BY e.event_date ASC, e.event_time ASC
+    LIMIT 10
+"""
+
+
+@ttl_cache(60)
+def _anonymous_group_detail(group_id):
+    """Group row and upcoming events as a logged-out visitor sees them (cached 1 min)"""
+    with db.get_cursor() as cursor:
+        cursor.execute(_GROUP_DETAIL_SQL, (group_id,))
+        group = cursor.fetchone()
+        upcoming_events = ()
+        if group and group['is_public'] and group['status'] == 'approved':
+            cursor.execute(_GROUP_EVENTS_SQL, (group_id, None, group_id))
+            upcoming_events = tuple(cursor.fetchall())
+        return group, upcoming_events
+
+
+def invalidate_group_detail_cache(group_id):
+    """Drop the logged-out group page data for a group (call after its events change)"""
+    _anonymous_group_detail.invalidate(group_id)
+
+
+def _invalidate_group_caches(group_id):
+    """Drop cached membership data and the logged-out group page data for a group"""
+    invalidate_membership_caches(group_id)
+    invalidate_group_detail_cache(group_id)
+
 # ===== [NEW] helpers for notifications (minimal addition) =====
+# Admin lookup SQL, bound on first use (the schema check needs an app context)
+_ADMIN_SQL = None
+
+
 def _get_admin_user_ids():
     """Return all admin user_ids (super_admin / support_technician) to notify."""
+    global _ADMIN_SQL
     try:
+        if _ADMIN_SQL is None:
+            # Fallback if column name differs
+            role_col = 'platform_role' if _has_column('users', 'platform_role') else 'role'
+            _ADMIN_SQL = f"SELECT user_id FROM users WHERE {role_col} IN ('super_admin','support_technician')"
         with db.get_cursor() as cur:
-            cur.execute("SELECT user_id FROM users WHERE platform_role IN ('super_admin','support_technician')")
-            rows = cur.fetchall() or []
-            if rows:
-                return [r['user_id'] for r in rows]
-    except Exception:
-        pass
-    # Fallback if column name differs
-    try:
-        with db.get_cursor() as cur:
-            cur.execute("SELECT user_id FROM users WHERE role IN ('super_admin','support_technician')")
-            rows = cur.fetchall() or []
-            return [r['user_id'] for r in rows]
+            cur.execute(_ADMIN_SQL)
+            return [r['user_id'] for r in cur.fetchall()]
     except Exception:
         return []
-    return []
 
+@ttl_cache(300, maxsize=4096)
 def _get_username(user_id: int) -> str:
-    try:
-        with db.get_cursor() as cur:
-            cur.execute("SELECT username FROM users WHERE user_id=%s", (user_id,))
-            row = cur.fetchone()
-            return row['username'] if row else ''
-    except Exception:
-        return ''
+    # Usernames rarely change; an admin rename shows up once the entry expires.
+    # Database errors propagate so that a failed lookup is not cached.
+    with db.get_cursor() as cur:
+        cur.execute("SELECT username FROM users WHERE user_id=%s", (user_id,))
+        row = cur.fetchone()
+        return row['username'] if row else ''
 
 
 # =============================================================================
@@ -101,44 +280,25 @@ def group_detail(group_id):
         user_id = get_current_user_id()
         
         with db.get_cursor() as cursor:
-            # Get group info with manager
-            cursor.execute(f"""
-                SELECT 
-                    g.group_id, g.name, g.description, {LOC_SELECT} AS location,
-                    g.group_type, g.is_public, g.max_members, g.status,
-                    g.created_at,
-                    COUNT(DISTINCT gm.membership_id) AS member_count,
-                    COUNT(DISTINCT CASE 
-                        WHEN e.status = 'scheduled' AND e.event_date >= CURDATE() 
-                        THEN e.event_id 
-                    END) AS upcoming_events_count,
-                    manager.username as manager_username,
-                    manager.platform_role as manager_platform_role
-                FROM group_info g
-                LEFT JOIN group_members gm ON g.group_id = gm.group_id AND gm.status = 'active'
-                LEFT JOIN event_info e ON g.group_id = e.group_id
-                LEFT JOIN group_members gm_manager ON g.group_id = gm_manager.group_id 
-                    AND gm_manager.group_role = 'manager' AND gm_manager.status = 'active'
-                LEFT JOIN users manager ON gm_manager.user_id = manager.user_id
-                WHERE g.group_id = %s
-                GROUP BY g.group_id, g.name, g.description, g.group_type, 
-                         g.is_public, g.max_members, g.status, g.created_at,
-                         manager.username, manager.platform_role
-            """, (group_id,))
-            group = cursor.fetchone()
+            if user_id:
+                cursor.execute(_GROUP_DETAIL_SQL, (group_id,))
+                group = cursor.fetchone()
+            else:
+                # Logged-out visitors all see the same data
+                group, anonymous_events = _anonymous_group_detail(group_id)
             
             if not group:
                 flash('Group not found.', 'error')
                 return redirect(url_for('explore', tab='groups'))
             
             # Check if group is approved (allow platform admins to see non-approved groups)
-            from .auth import is_super_admin, is_support_technician
-            if group['status'] != 'approved' and not (is_super_admin() or is_support_technician()):
+            is_admin = is_super_admin() or is_support_technician()
+            if group['status'] != 'approved' and not is_admin:
                 flash('This group is not accessible.', 'error')
                 return redirect(url_for('explore', tab='groups'))
             
             # For private groups, require login unless platform admin
-            if not group['is_public'] and (not user_id) and not (is_super_admin() or is_support_technician()):
+            if not group['is_public'] and (not user_id) and not is_admin:
                 flash('You must be logged in to view this group.', 'error')
                 return redirect(url_for('login'))
             
@@ -152,124 +312,27 @@ def group_detail(group_id):
                 """, (user_id, group_id))
                 user_membership = cursor.fetchone()
             
-            # Get upcoming events for this group WITH user registration info
-            # For private groups, only show events to group members (except admins)
-            if user_id:
-                if group['is_public'] or (is_super_admin() or is_support_technician()):
-                    # Public group OR admin user: show all events to logged-in users
-                    cursor.execute("""
-                        SELECT 
-                            e.event_id, e.event_title, e.event_type,
-                            e.event_date, e.event_time, e.location,
-                            e.max_participants,
-                            COUNT(DISTINCT em.membership_id) AS registered_count,
-                            MAX(CASE WHEN em.user_id = %s THEN em.event_role END) AS user_event_role,
-                            MAX(CASE WHEN em.user_id = %s THEN em.participation_status END) AS user_participation_status
-                        FROM event_info e
-                        LEFT JOIN event_members em ON e.event_id = em.event_id
-                            AND em.participation_status IN ('registered', 'attended')
-                            AND (em.event_role != 'volunteer' OR em.volunteer_status IS NULL OR em.volunteer_status != 'cancelled')
-                        WHERE e.group_id = %s
-                            AND e.status = 'scheduled'
-                            AND e.event_date >= CURDATE()
-                        GROUP BY e.event_id, e.event_title, e.event_type,
-                                 e.event_date, e.event_time, e.location, e.max_participants
-                        ORDER BY e.event_date ASC, e.event_time ASC
-                        LIMIT 10
-                    """, (user_id, user_id, group_id))
-                else:
-                    # Private group: only show events to group members
-                    cursor.execute("""
-                        SELECT 
-                            e.event_id, e.event_title, e.event_type,
-                            e.event_date, e.event_time, e.location,
-                            e.max_participants,
-                            COUNT(DISTINCT em.membership_id) AS registered_count,
-                            MAX(CASE WHEN em.user_id = %s THEN em.event_role END) AS user_event_role,
-                            MAX(CASE WHEN em.user_id = %s THEN em.participation_status END) AS user_participation_status
-                        FROM event_info e
-                        LEFT JOIN event_members em ON e.event_id = em.event_id
-                            AND em.participation_status IN ('registered', 'attended')
-                            AND (em.event_role != 'volunteer' OR em.volunteer_status IS NULL OR em.volunteer_status != 'cancelled')
-                        WHERE e.group_id = %s
-                            AND e.status = 'scheduled'
-                            AND e.event_date >= CURDATE()
-                            AND EXISTS (
-                                SELECT 1 FROM group_members gm 
-                                WHERE gm.group_id = e.group_id 
-                                AND gm.user_id = %s 
-                                AND gm.status = 'active'
-                            )
-                        GROUP BY e.event_id, e.event_title, e.event_type,
-                                 e.event_date, e.event_time, e.location, e.max_participants
-                        ORDER BY e.event_date ASC, e.event_time ASC
-                        LIMIT 10
-                    """, (user_id, user_id, group_id, user_id))
-            else:
-                # Not logged in: only show events from public groups
-                if group['is_public']:
-                    cursor.execute("""
-                        SELECT 
-                            e.event_id, e.event_title, e.event_type,
-                            e.event_date, e.event_time, e.location,
-                            e.max_participants,
-                            COUNT(DISTINCT em.membership_id) AS registered_count,
-                            NULL AS user_event_role,
-                            NULL AS user_participation_status
-                        FROM event_info e
-                        LEFT JOIN event_members em ON e.event_id = em.event_id
-                            AND em.participation_status IN ('registered', 'attended')
-                            AND (em.event_role != 'volunteer' OR em.volunteer_status IS NULL OR em.volunteer_status != 'cancelled')
-                        WHERE e.group_id = %s
-                            AND e.status = 'scheduled'
-                            AND e.event_date >= CURDATE()
-                        GROUP BY e.event_id, e.event_title, e.event_type,
-                                 e.event_date, e.event_time, e.location, e.max_participants
-                        ORDER BY e.event_date ASC, e.event_time ASC
-                        LIMIT 10
-                    """, (group_id,))
-                else:
-                    # Private group and not logged in: show no events
-                    upcoming_events = []
-            
-            # Only fetch events if we executed a query
-            if 'upcoming_events' not in locals():
-                upcoming_events = cursor.fetchall()
+            # Events of a private group are only shown to its active members (and admins)
+            can_see_events = bool(
+                group['is_public'] or is_admin
+                or (user_membership and user_membership['status'] == 'active')
+            )
             
-            # Calculate availability for events
-            for ev in upcoming_events:
-                reg = ev['registered_count'] or 0
-                maxp = ev['max_participants']
-                if maxp is None:
-                    ev['spots_available'] = None
-                    ev['is_full'] = False
+            # Get upcoming events for this group WITH user registration info
+            upcoming_events = []
+            if can_see_events:
+                if user_id:
+                    cursor.execute(_GROUP_EVENTS_SQL, (group_id, user_id, group_id))
+                    upcoming_events = cursor.fetchall()
                 else:
-                    ev['spots_available'] = maxp - reg
-                    ev['is_full'] = ev['spots_available'] <= 0
-                
-                # Add is_registered flag
-                ev['is_registered'] = ev['user_participation_status'] in ('registered', 'attended') if ev.get('user_participation_status') else False
+                    upcoming_events = anonymous_events
             
             # Determine if events are hidden due to privacy restrictions
-            events_hidden_due_to_privacy = False
-            if not group['is_public'] and user_id and (not user_membership or user_membership.get('status') != 'active') and not (is_super_admin() or is_support_technician()):
-                # Private group, logged in user, but not an active member (no membership or pending) and not admin
-                events_hidden_due_to_privacy = True
-            elif not group['is_public'] and not user_id:
-                # Private group and not logged in
-                events_hidden_due_to_privacy = True
-            
-            # Get group members list (only for public groups and logged-in users)
-            group_members = []
-            if group['is_public'] and user_id:
-                cursor.execute("""
-                    SELECT u.username
-                    FROM group_members gm
-                    JOIN users u ON gm.user_id = u.user_id
-                    WHERE gm.group_id = %s AND gm.status = 'active'
-                    ORDER BY u.username ASC
-                """, (group_id,))
-                group_members = cursor.fetchall()
+            # (private group, and the viewer is neither an active member nor an admin)
+            events_hidden_due_to_privacy = not can_see_events
+        
+        # Member list is fetched by the page after load (public groups, logged-in users)
+        load_group_members = bool(group['is_public'] and user_id)
         
         # Get user's group role for analytics button
         user_group_role = None
@@ -282,13 +345,46 @@ def group_detail(group_id):
                              user_group_role=user_group_role,
                              upcoming_events=upcoming_events,
                              events_hidden_due_to_privacy=events_hidden_due_to_privacy,
-                             group_members=group_members)
+                             load_group_members=load_group_members)
     
-    except Exception as e:
-        print(f"Error loading group detail: {e}")
+    except Exception:
+        logger.exception("load group detail failed (group_id=%s)", group_id)
         flash('Error loading group details.', 'error')
         return redirect(url_for('explore', tab='groups'))
 
+@app.route('/groups/<int:group_id>/members')
+@require_login
+def group_members_list(group_id):
+    """Active member usernames of a public group (JSON, loaded by group_detail)"""
+    try:
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT is_public, status FROM group_info WHERE group_id = %s
+            """, (group_id,))
+            group = cursor.fetchone()
+            # Same visibility as group_detail: platform admins also see
+            # groups that are not approved
+            is_admin = is_super_admin() or is_support_technician()
+            if (not group or not group['is_public']
+                    or (group['status'] != 'approved' and not is_admin)):
+                return jsonify({"ok": False, "msg": "Group not found"}), 404
+            
+            cursor.execute("""
+                SELECT u.username
+                FROM group_members gm
+                JOIN users u ON gm.user_id = u.user_id
+                WHERE gm.group_id = %s AND gm.status = 'active'
+                ORDER BY u.username ASC
+            """, (group_id,))
+            members = [row['username'] for row in cursor.fetchall()]
+        
+        return jsonify({"ok": True, "members": members})
+    
+    except Exception:
+        logger.exception("load group members failed (group_id=%s)", group_id)
+        return jsonify({"ok": False, "msg": "Error loading group members"}), 500
+
+
 @app.route('/groups/<int:group_id>/join')
 @require_login
 def group_join(group_id):
@@ -296,13 +392,26 @@ def group_join(group_id):
     try:
         user_id = get_current_user_id()
         
-        with db.get_cursor() as cursor:
-            # Check if group exists and is public
+        with db.transaction() as cursor:
+            # Check if group exists and is public, together with its active member
+            # count and the user's membership / joined-group count (one round trip).
+            # Locking the group row serialises concurrent joins to the same group,
+            # so the capacity check still holds at INSERT time.
             cursor.execute("""
-                SELECT name, is_public, status, max_members
-                FROM group_info
-                WHERE group_id = %s
-            """, (group_id,))
+                SELECT g.name, g.is_public, g.status, g.max_members,
+                       (SELECT COUNT(*)
+                        FROM group_members
+                        WHERE group_id = g.group_id AND status = 'active') AS current_count,
+                       (SELECT status
+                        FROM group_members
+                        WHERE user_id = %(user_id)s AND group_id = g.group_id) AS my_status,
+                       (SELECT COUNT(*)
+                        FROM group_members
+                        WHERE user_id = %(user_id)s AND status = 'active') AS my_group_count
+                FROM group_info g
+                WHERE g.group_id = %(group_id)s
+                FOR UPDATE OF g
+            """, {'user_id': user_id, 'group_id': group_id})
             group = cursor.fetchone()
             
             if not group:
@@ -314,35 +423,20 @@ def group_join(group_id):
                 return redirect(url_for('group_detail', group_id=group_id))
             
             # Check if already a member
-            cursor.execute("""
-                SELECT status
-                FROM group_members
-                WHERE user_id = %s AND group_id = %s
-            """, (user_id, group_id))
-            existing = cursor.fetchone()
-            
-            if existing:
-                if existing['status'] == 'active':
+            if group['my_status']:
+                if group['my_status'] == 'active':
                     flash('You are already a member of this group.', 'info')
                 else:
                     flash('You have a pending request for this group.', 'info')
                 return redirect(url_for('group_detail', group_id=group_id))
             
             # Check the number of groups the user has joined (up to 10)
-            cursor.execute("""
-                SELECT COUNT(*) AS group_count
-                FROM group_members
-                WHERE user_id = %s AND status = 'active'
-""", (user_id,))
-            user_group_count = cursor.fetchone()['group_count']
-
-            if user_group_count >= 10:
+            if group['my_group_count'] >= 10:
                 flash('You have reached the maximum limit of 10 groups. Please leave a group before joining a new one.', 'warning')
                 return redirect(url_for('group_detail', group_id=group_id))
                         
             # Check capacity
-            current_count = _active_member_count(group_id)
-            if current_count >= group['max_members']:
+            if group['current_count'] >= group['max_members']:
                 flash('This group has reached maximum capacity.', 'warning')
                 return redirect(url_for('group_detail', group_id=group_id))
             
@@ -354,16 +448,11 @@ def group_join(group_id):
                     VALUES (%s, %s, 'member', 'active')
                 """, (user_id, group_id))
                 
-                # Send notification
-                noti.create_noti(
-                    user_id=user_id,
-                    title='Successfully Joined Group',
-                    message=f'You have joined "{group["name"]}"! You can now participate in group events and activities.',
-                    category='group',
-                    related_id=group_id
-                )
-                
-                flash(f'Successfully joined "{group["name"]}"!', 'success')
+                notis = [(user_id, 'Successfully Joined Group',
+                          f'You have joined "{group["name"]}"! You can now participate in group events and activities.',
+                          'group', group_id)]
+                flash_message = f'Successfully joined "{group["name"]}"!'
+                flash_category = 'success'
             else:
                 # Request to join private groups
                 # Store pending event info in session for later use during approval
@@ -394,39 +483,25 @@ def group_join(group_id):
                     VALUES (%s, %s, 'member', 'pending')
                 """, (user_id, group_id))
                 
-                # Send notification to user
-                noti.create_noti(
-                    user_id=user_id,
-                    title='Join Request Submitted',
-                    message=f'Your request to join "{group["name"]}" has been submitted and is awaiting approval.',
-                    category='group',
-                    related_id=group_id
-                )
-                
-                # Send notification to group managers
-                cursor.execute("""
-                    SELECT gm.user_id, u.username
-                    FROM group_members gm
-                    JOIN users u ON gm.user_id = u.user_id
-                    WHERE gm.group_id = %s AND gm.group_role = 'manager' AND gm.status = 'active'
-                """, (group_id,))
-                managers = cursor.fetchall()
-                
-                for manager in managers:
-                    noti.create_noti(
-                        user_id=manager['user_id'],
-                        title='New Group Join Request',
-                        message=f'A new request to join "{group["name"]}" has been submitted and is awaiting your approval.',
-                        category='group',
-                        related_id=group_id
-                    )
-                
-                flash(f'Your request to join "{group["name"]}" has been submitted for approval.', 'info')
-            
-            return redirect(url_for('group_detail', group_id=group_id))
+                # Notify the user and the group managers with one background INSERT
+                notis = [(user_id, 'Join Request Submitted',
+                          f'Your request to join "{group["name"]}" has been submitted and is awaiting approval.',
+                          'group', group_id)]
+                notis += [(manager_id, 'New Group Join Request',
+                           f'A new request to join "{group["name"]}" has been submitted and is awaiting your approval.',
+                           'group', group_id)
+                          for manager_id in get_group_manager_ids(group_id)]
+                flash_message = f'Your request to join "{group["name"]}" has been submitted for approval.'
+                flash_category = 'info'
+        
+        # Written in the background once the membership row has been committed
+        _invalidate_group_caches(group_id)
+        noti.enqueue_rows(notis)
+        flash(flash_message, flash_category)
+        return redirect(url_for('group_detail', group_id=group_id))
     
-    except Exception as e:
-        print(f"Error joining group: {e}")
+    except Exception:
+        logger.exception("join group failed (group_id=%s)", group_id)
         flash('An error occurred while joining the group.', 'error')
         return redirect(url_for('explore', tab='groups'))
 
@@ -438,7 +513,8 @@ def group_leave(group_id):
     try:
         user_id = get_current_user_id()
         
-        with db.get_cursor() as cursor:
+        # Both DELETEs commit together
+        with db.transaction() as cursor:
             # Check membership
             cursor.execute("""
                 SELECT gm.group_role, g.name, gm.status
@@ -458,36 +534,42 @@ def group_leave(group_id):
                 WHERE user_id = %s AND group_id = %s
             """, (user_id, group_id))
 
+            # Also unregister from the group's events: the user's rows come from
+            # uniq_user_event, the group's event ids from idx_group_id
             cursor.execute("""
-                DELETE em FROM event_members em
-                JOIN event_info e ON em.event_id = e.event_id
-                WHERE em.user_id = %s AND e.group_id = %s
+                DELETE FROM event_members
+                WHERE user_id = %s
+                  AND event_id IN (SELECT event_id FROM event_info WHERE group_id = %s)
             """, (user_id, group_id))
             
-            # Send notification
-            if membership['status'] == 'pending':
-                noti.create_noti(
-                    user_id=user_id,
-                    title='Join Request Cancelled',
-                    message=f'You have cancelled your request to join "{membership["name"]}". You can reapply anytime if you change your mind.',
-                    category='group',
-                    related_id=group_id
-                )
-                flash(f'Your request to join "{membership["name"]}" has been cancelled.', 'success')
-            else:
-                noti.create_noti(
-                    user_id=user_id,
-                    title='Left Group',
-                    message=f'You have left "{membership["name"]}". You can rejoin anytime if you change your mind.',
-                    category='group',
-                    related_id=group_id
-                )
-                flash(f'You have left "{membership["name"]}".', 'success')
-            
-            return redirect(url_for('group_detail', group_id=group_id))
+        _invalidate_group_caches(group_id)
+        if membership['group_role'] == 'manager':
+            get_group_manager_ids.invalidate(group_id)
+
+        # Send notification (written in the background) once both DELETEs have committed
+        if membership['status'] == 'pending':
+            noti.enqueue(
+                user_id=user_id,
+                title='Join Request Cancelled',
+                message=f'You have cancelled your request to join "{membership["name"]}". You can reapply anytime if you change your mind.',
+                category='group',
+                related_id=group_id
+            )
+            flash(f'Your request to join "{membership["name"]}" has been cancelled.', 'success')
+        else:
+            noti.enqueue(
+                user_id=user_id,
+                title='Left Group',
+                message=f'You have left "{membership["name"]}". You can rejoin anytime if you change your mind.',
+                category='group',
+                related_id=group_id
+            )
+            flash(f'You have left "{membership["name"]}".', 'success')
+        
+        return redirect(url_for('group_detail', group_id=group_id))
     
-    except Exception as e:
-        print(f"Error leaving group: {e}")
+    except Exception:
+        logger.exception("leave group failed (group_id=%s)", group_id)
         flash('An error occurred while leaving the group.', 'error')
         return redirect(url_for('group_detail', group_id=group_id))
 
@@ -518,21 +600,22 @@ def cancel_group_request(group_id):
                 DELETE FROM group_members
                 WHERE membership_id = %s
             """, (request['membership_id'],))
-            
-            # Send notification to user
-            noti.create_noti(
-                user_id=user_id,
-                title='Join Request Cancelled',
-                message=f'You have cancelled your request to join "{request["name"]}". You can reapply anytime if you change your mind.',
-                category='group',
-                related_id=group_id
-            )
-            
-            flash(f'Your request to join "{request["name"]}" has been cancelled.', 'success')
-            return redirect(url_for('group_detail', group_id=group_id))
+        
+        # Send notification to user (written in the background) once the delete has committed
+        _invalidate_group_caches(group_id)
+        noti.enqueue(
+            user_id=user_id,
+            title='Join Request Cancelled',
+            message=f'You have cancelled your request to join "{request["name"]}". You can reapply anytime if you change your mind.',
+            category='group',
+            related_id=group_id
+        )
+        
+        flash(f'Your request to join "{request["name"]}" has been cancelled.', 'success')
+        return redirect(url_for('group_detail', group_id=group_id))
     
-    except Exception as e:
-        print(f"Error cancelling group request: {e}")
+    except Exception:
+        logger.exception("cancel group request failed (group_id=%s)", group_id)
         flash('An error occurred while cancelling the request.', 'error')
         return redirect(url_for('group_detail', group_id=group_id))
 
@@ -569,7 +652,7 @@ def group_apply_for_participant():
 
         if not name:
             flash('Group name cannot be empty', 'danger');  return redirect(request.url)
-        if group_type not in GROUP_TYPES:
+        if group_type not in GROUP_TYPES_SET:
             flash('Group type illegal', 'danger');           return redirect(request.url)
         
         # Check for duplicate group name
@@ -588,91 +671,42 @@ def group_apply_for_participant():
                 """, (resume_id, uid))
                 own = cur.fetchone()
                 if own:
-                    clear_rej = ", rejection_reason=NULL" if status_to_set == 'pending' else ""
-                    if HAS_LOCATION:
-                        try:
-                            cur.execute(f"""
-                                UPDATE group_info
-                                   SET name=%s, description=%s, group_location=%s, group_type=%s,
-                                       is_public=%s, max_members=%s, status=%s{clear_rej}
-                                 WHERE group_id=%s
-                            """, (name, description, location, group_type,
-                                  1 if visibility == 'public' else 0, max_members, status_to_set, resume_id))
-                        except Exception:
-                            cur.execute("""
-                                UPDATE group_info
-                                   SET name=%s, description=%s, group_location=%s, group_type=%s,
-                                       is_public=%s, max_members=%s, status=%s
-                                 WHERE group_id=%s
-                            """, (name, description, location, group_type,
-                                  1 if visibility == 'public' else 0, max_members, status_to_set, resume_id))
-                    else:
-                        try:
-                            cur.execute(f"""
-                                UPDATE group_info
-                                   SET name=%s, description=%s, group_type=%s,
-                                       is_public=%s, max_members=%s, status=%s{clear_rej}
-                                 WHERE group_id=%s
-                            """, (name, description, group_type,
-                                  1 if visibility == 'public' else 0, max_members, status_to_set, resume_id))
-                        except Exception:
-                            cur.execute("""
-                                UPDATE group_info
-                                   SET name=%s, description=%s, group_type=%s,
-                                       is_public=%s, max_members=%s, status=%s
-                                 WHERE group_id=%s
-                            """, (name, description, group_type,
-                                  1 if visibility == 'public' else 0, max_members, status_to_set, resume_id))
+                    cur.execute(_APPLY_UPDATE_SQL,
+                                (name, description, *_loc_params(location), group_type,
+                                 1 if visibility == 'public' else 0, max_members, status_to_set, resume_id))
                     gid = resume_id
 
             # Otherwise insert a new record
             if gid is None:
-                if HAS_LOCATION:
-                    cur.execute("""
-                        INSERT INTO group_info
-                          (name, description, group_location, group_type, is_public, max_members, status, created_by)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (name, description, location, group_type,
-                          1 if visibility == 'public' else 0, max_members, status_to_set, uid))
-                else:
-                    cur.execute("""
-                        INSERT INTO group_info
-                          (name, description, group_type, is_public, max_members, status, created_by)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """, (name, description, group_type,
-                          1 if visibility == 'public' else 0, max_members, status_to_set, uid))
+                cur.execute(_APPLY_INSERT_SQL,
+                            (name, description, *_loc_params(location), group_type,
+                             1 if visibility == 'public' else 0, max_members, status_to_set, uid))
                 gid = cur.lastrowid
+        _invalidate_group_counts()
 
         # Draft: Prompt and return only
         if action == 'save_draft':
             flash('Draft saved. You can return and submit it later.', 'success')
             return redirect(url_for('group_apply_for_participant'))
 
-        # Submit for review: send notification (applicant + administrator)
+        # Submit for review: notify the applicant and every administrator with one
+        # background INSERT (both lookups fall back to empty values on error)
         try:
-            noti.create_noti(
-                user_id=uid,
-                title='Group application submitted',
-                message=f'Your application for "{name}" has been submitted and is pending review.',
-                category='group',
-                related_id=gid
-            )
+            applicant = _get_username(uid)
         except Exception:
-            pass
-
+            logger.exception("applicant username lookup failed")
+            applicant = ''
+        vis_label = 'Public' if visibility == 'public' else 'Private'
+        admin_msg = (f'Applicant: {applicant or "N/A"} | '
+                     f'Name: "{name}" | Type: {group_type} | Visibility: {vis_label} | '
+                     f'Max: {max_members} | Location: {location or "-"}')
+        notis = [(uid, 'Group application submitted',
+                  f'Your application for "{name}" has been submitted and is pending review.',
+                  'group', gid)]
+        notis += [(aid, 'New Group Application', admin_msg, 'group', gid)
+                  for aid in _get_admin_user_ids()]
         try:
-            applicant = _get_username(uid)
-            vis_label = 'Public' if visibility == 'public' else 'Private'
-            for aid in _get_admin_user_ids():
-                noti.create_noti(
-                    user_id=aid,
-                    title='New Group Application',
-                    message=(f'Applicant: {applicant or "N/A"} | '
-                             f'Name: "{name}" | Type: {group_type} | Visibility: {vis_label} | '
-                             f'Max: {max_members} | Location: {location or "-"}'),
-                    category='group',
-                    related_id=gid
-                )
+            noti.enqueue_rows(notis)
         except Exception:
             pass
 
@@ -682,15 +716,7 @@ def group_apply_for_participant():
     # ---------- GET: Pre-fill the most recent "rejected/draft" record (rejected first) ----------
     prefill, resume_id = None, None
     with db.get_cursor() as cur:
-        cur.execute(f"""
-            SELECT group_id, name, description, {LOC_SELECT} AS location,
-                   group_type, is_public, max_members, status, rejection_reason,
-                   COALESCE(updated_at, created_at) AS ts
-              FROM group_info
-             WHERE created_by=%s AND status IN ('rejected','draft')
-             ORDER BY (status='rejected') DESC, ts DESC
-             LIMIT 1
-        """, (uid,))
+        cur.execute(_APPLY_PREFILL_SQL, {'uid': uid})
         row = cur.fetchone()
         if row:
             prefill = {
@@ -719,6 +745,130 @@ def group_apply_for_participant():
 
 
 # ============== 1) Listing Page ==============
+# sort option -> (ORDER BY, keyset condition for the next page, sort column).
+# group_id breaks ties so every ordering is total. The type/status orderings
+# sort ENUM columns by their declared index (which a row-constructor comparison
+# against a string cursor value would not follow) and page by OFFSET.
+_GROUPS_INDEX_ORDERS = {
+    'newest': ("g.created_at DESC, g.group_id DESC", "(g.created_at, g.group_id) < (%s, %s)", 'created_at'),
+    'oldest': ("g.created_at ASC, g.group_id ASC", "(g.created_at, g.group_id) > (%s, %s)", 'created_at'),
+    'name_asc': ("g.name ASC, g.group_id ASC", "(g.name, g.group_id) > (%s, %s)", 'name'),
+    'name_desc': ("g.name DESC, g.group_id DESC", "(g.name, g.group_id) < (%s, %s)", 'name'),
+    'type_asc': ("g.group_type ASC, g.name ASC, g.group_id ASC", None, None),
+    'type_desc': ("g.group_type DESC, g.name ASC, g.group_id ASC", None, None),
+    'status_asc': ("g.status ASC, g.name ASC, g.group_id ASC", None, None),
+    'status_desc': ("g.status DESC, g.name ASC, g.group_id ASC", None, None),
+}
+
+# listing tab -> status filter; any other tab value shows the approved tab.
+_GROUPS_INDEX_TAB_WHERE = {
+    'pending': "g.status = 'pending'",
+    'approved': "g.status != 'pending'",
+}
+
+_GROUPS_INDEX_APPROVER_JOIN = "JOIN group_approvals ga ON ga.group_id = g.group_id AND ga.approver_id = %s"
+# name search: None (no search), ngram FULLTEXT phrase search, or the LIKE scan
+_GROUPS_INDEX_SEARCH_CONDITIONS = {
+    None: "",
+    'fulltext': "AND MATCH(g.name) AGAINST (%s IN BOOLEAN MODE)",
+    'like': "AND LOWER(g.name) LIKE LOWER(%s)",
+}
+
+# The pending tab also shows who submitted each group
+_GROUPS_INDEX_CREATOR = {
+    'pending': ("u.username, u.first_name, u.last_name, u.email",
+                "JOIN users u ON g.created_by = u.user_id"),
+    'approved': ("NULL as username, NULL as first_name, NULL as last_name, NULL as email", ""),
+}
+
+_GROUPS_INDEX_SQL = """
+    SELECT
+        g.group_id, g.name, g.description, {loc_select} AS location,
+        g.group_type, g.is_public, g.max_members, g.status, g.created_at, g.updated_at,
+        {creator_columns}
+    FROM group_info g
+    {creator_join}
+    {approver_join}
+    WHERE {tab_condition} {search_condition} {page_condition}
+    ORDER BY {order_clause}
+    {limit_clause}
+"""
+
+# One complete statement per (tab, approver filter, search mode, sort, keyset
+# page) combination; only sorts with a keyset condition get keyset variants.
+# Parameters go approver_id, search pattern, keyset values, then LIMIT/OFFSET.
+_GROUPS_INDEX_QUERIES = {
+    (tab, filtering, search, sort, keyset): _GROUPS_INDEX_SQL.format(
+        loc_select=LOC_SELECT,
+        creator_columns=_GROUPS_INDEX_CREATOR[tab][0],
+        creator_join=_GROUPS_INDEX_CREATOR[tab][1],
+        approver_join=_GROUPS_INDEX_APPROVER_JOIN if filtering else "",
+        tab_condition=tab_condition,
+        search_condition=search_condition,
+        page_condition=f"AND {seek_condition}" if keyset else "",
+        order_clause=order_clause,
+        limit_clause="LIMIT %s" if keyset else "LIMIT %s OFFSET %s",
+    )
+    for tab, tab_condition in _GROUPS_INDEX_TAB_WHERE.items()
+    for filtering in (False, True)
+    for search, search_condition in _GROUPS_INDEX_SEARCH_CONDITIONS.items()
+    for sort, (order_clause, seek_condition, _) in _GROUPS_INDEX_ORDERS.items()
+    for keyset in ((False, True) if seek_condition else (False,))
+}
+
+_GROUPS_INDEX_COUNT_QUERIES = {
+    (tab, filtering, search): f"""
+        SELECT COUNT(*) AS total
+        FROM group_info g
+        {_GROUPS_INDEX_APPROVER_JOIN if filtering else ""}
+        WHERE {tab_condition} {search_condition}
+    """
+    for tab, tab_condition in _GROUPS_INDEX_TAB_WHERE.items()
+    for filtering in (False, True)
+    for search, search_condition in _GROUPS_INDEX_SEARCH_CONDITIONS.items()
+}
+
+
+def _execute_groups_index(cur, statements, key, approver_id, search_query, tail_params=()):
+    """Execute statements[key(search mode)] with the approver, search and
+    trailing parameters.
+
+    A search uses the ngram FULLTEXT index on group_info.name as a phrase
+    match; one-character queries (shorter than an ngram token), queries with
+    BOOLEAN MODE operators, and databases without ft_group_name use LIKE.
+    """
+    params = [approver_id] if approver_id is not None else []
+    if not search_query:
+        cur.execute(statements[key(None)], params + list(tail_params))
+        return
+    if len(search_query) > 1 and not FULLTEXT_OPERATORS.search(search_query):
+        try:
+            cur.execute(statements[key('fulltext')], params + [f'"{search_query}"'] + list(tail_params))
+            return
+        except MySQLdb.OperationalError:
+            # ft_group_name has not been created on this database
+            pass
+    cur.execute(statements[key('like')], params + [f"%{search_query}%"] + list(tail_params))
+
+@ttl_cache(30)
+def _count_groups(pending: bool, search_query: str, approver_id) -> int:
+    """Number of groups on the pending (or every other) listing tab whose name
+    contains `search_query`, optionally only those approved by `approver_id`;
+    cleared by _invalidate_group_counts()."""
+    tab = 'pending' if pending else 'approved'
+    with db.get_cursor() as cur:
+        _execute_groups_index(cur, _GROUPS_INDEX_COUNT_QUERIES,
+                              lambda search: (tab, approver_id is not None, search),
+                              approver_id, search_query)
+        return cur.fetchone()['total']
+
+
+def _invalidate_group_counts():
+    """Drop the cached listing counts after a group is added, renamed, deleted
+    or changes status."""
+    _count_groups.cache_clear()
+
+
 @app.route('/super-admin/groups', methods=['GET'])
 @app.route('/admin/groups', methods=['GET'])
 @require_platform_role('super_admin', 'support_technician')
@@ -726,122 +876,82 @@ def groups_index():
     # Get sort parameter, tab, search query, and approver filter
     sort_by = request.args.get('sort', 'newest').strip()
     tab = request.args.get('tab', 'approved').strip()
+    if tab not in _GROUPS_INDEX_TAB_WHERE:
+        tab = 'approved'
     search_query = request.args.get('search', '').strip()
     approver_filter = request.args.get('approver', '').strip()
+    approver_id = int(approver_filter) if approver_filter.isdigit() else None
     
     # Pagination params via util.py
-    from eventbridge_plus.util import get_pagination_params, create_pagination_info, create_pagination_links
+    from eventbridge_plus.util import (get_pagination_params, create_pagination_info, create_pagination_links,
+                                       encode_page_cursor, decode_page_cursor)
     page, per_page = get_pagination_params(request, default_per_page=10)
 
-    # Build order clause
-    order_clause = "created_at DESC"  # Default to newest
-    if sort_by == 'oldest':
-        order_clause = "created_at ASC"
-    elif sort_by == 'name_asc':
-        order_clause = "name ASC"
-    elif sort_by == 'name_desc':
-        order_clause = "name DESC"
-    elif sort_by == 'type_asc':
-        order_clause = "group_type ASC, name ASC"
-    elif sort_by == 'type_desc':
-        order_clause = "group_type DESC, name ASC"
-    elif sort_by == 'status_asc':
-        order_clause = "status ASC, name ASC"
-    elif sort_by == 'status_desc':
-        order_clause = "status DESC, name ASC"
+    if sort_by not in _GROUPS_INDEX_ORDERS:
+        sort_by = 'newest'
+    seek_condition, sort_column = _GROUPS_INDEX_ORDERS[sort_by][1:]
+    
+    # Only the current page is read from the database. "Next" links carry the
+    # last row's sort key, so that page seeks past it instead of skipping
+    # OFFSET rows; page jumps and the type/status sorts still use OFFSET.
+    start_idx = (page - 1) * per_page
+    after = decode_page_cursor(request.args.get('after'))
+    # The token comes from the client: seek only on a well-formed
+    # [tab, sort, sort value, group_id] key, otherwise fall back to OFFSET
+    keyset = (seek_condition is not None and page > 1 and bool(after)
+              and len(after) == 4 and after[:2] == [tab, sort_by]
+              and isinstance(after[2], str) and type(after[3]) is int)
+    if keyset:
+        page_params = after[2:] + [per_page]
+    else:
+        page_params = [per_page, start_idx]
     
     with db.get_cursor() as cur:
-        # Build search condition
-        search_condition = ""
-        search_params = []
-        if search_query:
-            search_condition = "AND LOWER(g.name) LIKE LOWER(%s)"
-            search_params.append(f"%{search_query}%")
+        # Approver filter (index-backed join) and name search
+        _execute_groups_index(cur, _GROUPS_INDEX_QUERIES,
+                              lambda search: (tab, approver_id is not None, search, sort_by, keyset),
+                              approver_id, search_query, page_params)
+        groups = cur.fetchall()
         
-        if tab == 'pending':
-            # Show only pending groups
-            cur.execute(f"""
-                SELECT
-                    g.group_id, g.name, g.description, {LOC_SELECT} AS location,
-                    g.group_type, g.is_public, g.max_members, g.status, g.created_at, g.updated_at,
-                    u.username, u.first_name, u.last_name, u.email
-                FROM group_info g
-                JOIN users u ON g.created_by = u.user_id
-                WHERE g.status = 'pending' {search_condition}
-                ORDER BY {order_clause}
-            """, search_params)
-        else:
-            # Show all groups except pending (default)
-            cur.execute(f"""
-                SELECT
-                    g.group_id, g.name, g.description, {LOC_SELECT} AS location,
-                    g.group_type, g.is_public, g.max_members, g.status, g.created_at, g.updated_at,
-                    NULL as username, NULL as first_name, NULL as last_name, NULL as email
-                FROM group_info g
-                WHERE g.status != 'pending' {search_condition}
-                ORDER BY {order_clause}
-            """, search_params)
-        groups_all = cur.fetchall()
-
-        # total count for selected tab
-        if tab == 'pending':
-            cur.execute(f"""
-                SELECT COUNT(*) AS total
-                FROM group_info g
-                WHERE g.status = 'pending' {search_condition}
-            """, search_params)
-        else:
+        # Sort key of the page's last row, for the "Next" link
+        next_cursor = None
+        if seek_condition is not None and groups:
+            last = groups[-1]
+            next_cursor = encode_page_cursor(tab, sort_by, str(last[sort_column]), last['group_id'])
+
+        # total count for selected tab, and total pending count (regardless of
+        # search); on a cache miss these join this block's transaction
+        total_groups = _count_groups(tab == 'pending', search_query, approver_id)
+        total_pending_count = _count_groups(True, '', None)
+
+        # Get approver information for every group on the page in one query
+        approvals = {}
+        if groups:
+            placeholders = ','.join(['%s'] * len(groups))
             cur.execute(f"""
-                SELECT COUNT(*) AS total
-                FROM group_info g
-                WHERE g.status != 'pending' {search_condition}
-            """, search_params)
-        total_groups = cur.fetchone()['total']
-
-        # Get total pending count (regardless of search)
+                SELECT ga.group_id, ga.approver_id, u.username, ga.approved_at
+                FROM group_approvals ga
+                JOIN users u ON ga.approver_id = u.user_id
+                WHERE ga.group_id IN ({placeholders})
+            """, [group['group_id'] for group in groups])
+            for record in cur.fetchall():
+                approvals[record['group_id']] = {
+                    'user_id': record['approver_id'],
+                    'username': record['username'],
+                    'approved_at': record['approved_at']
+                }
+        
+        # Get list of approvers for the dropdown filter (only those who actually approved groups)
         cur.execute("""
-            SELECT COUNT(*) AS total
-            FROM group_info
-            WHERE status = 'pending'
+            SELECT u.user_id, u.username
+            FROM users u
+            WHERE EXISTS (SELECT 1 FROM group_approvals ga WHERE ga.approver_id = u.user_id)
+            ORDER BY u.username
         """)
-        total_pending_count = cur.fetchone()['total']
-
-    # slice current page
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    groups = groups_all[start_idx:end_idx]
+        approvers = cur.fetchall()
     
-    # Get approver information for each group
     for group in groups:
-        group_id = group['group_id']
-        approved_by = None
-        
-        # Find approver information from approval records
-        with db.get_cursor() as cur:
-            cur.execute("""
-                SELECT n.user_id, u.username, n.created_at
-                FROM notifications n
-                JOIN users u ON n.user_id = u.user_id
-                WHERE n.category = 'system' 
-                AND n.message LIKE %s
-                ORDER BY n.created_at DESC
-                LIMIT 1
-            """, (f'APPROVED_GROUP:{group_id}:%',))
-            
-            approval_record = cur.fetchone()
-            if approval_record:
-                approved_by = {
-                    'user_id': approval_record['user_id'],
-                    'username': approval_record['username'],
-                    'approved_at': approval_record['created_at']
-                }
-        
-        group['approved_by'] = approved_by
-    
-    # Apply approver filter if specified
-    if approver_filter:
-        groups = [group for group in groups 
-                 if group['approved_by'] and group['approved_by']['user_id'] == int(approver_filter)]
+        group['approved_by'] = approvals.get(group['group_id'])
 
     base_url = url_for('groups_index')
     pagination = create_pagination_info(
@@ -851,21 +961,12 @@ def groups_index():
         base_url=base_url,
         sort=sort_by,
         tab=tab,
-        search=search_query or None
+        search=search_query or None,
+        approver=approver_id
     )
+    if pagination['has_next'] and next_cursor:
+        pagination['page_urls'][pagination['next_num']] += f"&after={next_cursor}"
     pagination_links = create_pagination_links(pagination)
-    
-    # Get list of approvers for the dropdown filter (only those who actually approved groups)
-    with db.get_cursor() as cur:
-        cur.execute("""
-            SELECT DISTINCT u.user_id, u.username
-            FROM notifications n
-            JOIN users u ON n.user_id = u.user_id
-            WHERE n.category = 'system' 
-            AND n.message LIKE 'APPROVED_GROUP:%'
-            ORDER BY u.username
-        """)
-        approvers = cur.fetchall()
 
     return render_template('admin/groups_list.html', 
                          groups=groups, 
@@ -899,11 +1000,11 @@ def group_create():
         # Basic verification
         if not name:
             flash('Group name cannot be empty', 'danger');  return redirect(request.url)
-        if group_type not in GROUP_TYPES:
+        if group_type not in GROUP_TYPES_SET:
             flash('Group type illegal', 'danger');     return redirect(request.url)
         if max_members <= 0:
             flash('max_members Must be greater than 0', 'danger'); return redirect(request.url)
-        if HAS_LOCATION and location and location not in AVAILABLE_LOCATIONS:
+        if HAS_LOCATION and location and location not in AVAILABLE_LOCATIONS_SET:
             flash('Location Not allowed', 'danger'); return redirect(request.url)
         
         # Check for duplicate group name
@@ -917,9 +1018,19 @@ def group_create():
             return redirect(url_for('groups_index'))
 
         # Verify before creation: The initial number of members does not exceed the upper limit
+        # (the users found here are also the ones added below)
         usernames = []
+        cand_users = []
         if members_csv:
-            usernames = [x.strip() for x in members_csv.split(',') if x.strip()]
+            # distinct names, in the order given
+            usernames = list(dict.fromkeys(x.strip() for x in members_csv.split(',') if x.strip()))
+        if len(usernames) > max_members:
+            flash(
+                f'Initial member list（{len(usernames)}）Exceed the upper limit（{max_members}），Please reduce it and try again.',
+                'danger'
+            )
+            return redirect(request.url)
+        if usernames:
             with db.get_cursor() as cur:
                 placeholders = ",".join(["%s"] * len(usernames))
                 cur.execute(
@@ -936,42 +1047,21 @@ def group_create():
 
         # Insert group (super administrator directly approved)
         with db.get_cursor() as cur:
-            if HAS_LOCATION:
-                cur.execute("""
-                    INSERT INTO group_info
-                        (name, description, group_location, group_type, is_public, max_members, status, created_by)
-                    VALUES (%s, %s, %s, %s, %s, %s, 'approved', %s)
-                """, (name, description, location, group_type, is_public, max_members, creator_id))
-            else:
-                cur.execute("""
-                    INSERT INTO group_info
-                        (name, description, group_type, is_public, max_members, status, created_by)
-                    VALUES (%s, %s, %s, %s, %s, 'approved', %s)
-                """, (name, description, group_type, is_public, max_members, creator_id))
+            cur.execute(_CREATE_GROUP_SQL,
+                        (name, description, *_loc_params(location), group_type, is_public, max_members,
+                         members_csv or None, creator_id))
             gid = cur.lastrowid
 
-            if members_csv:
-                cur.execute("UPDATE group_info SET first_members=%s WHERE group_id=%s",
-                            (members_csv, gid))
-
-            if members_csv and usernames:
-                placeholders = ",".join(["%s"] * len(usernames))
-                cur.execute(
-                    f"SELECT user_id FROM users WHERE username IN ({placeholders})",
-                    tuple(usernames),
-                )
-                rows = cur.fetchall() or []
-                if rows:
-                    cur.executemany("""
-                        INSERT IGNORE INTO group_members (user_id, group_id, group_role, status)
-                        VALUES (%s, %s, 'member', 'active')
-                    """, [(r['user_id'], gid) for r in rows])
-
-            # Add the creator (admin) as group manager
-            cur.execute("""
+            # The creator (admin) as group manager plus the initial members, in
+            # one multi-row INSERT (executemany only batches a VALUES list made
+            # entirely of placeholders); the creator comes first so that being
+            # listed among the members does not demote them
+            cur.executemany("""
                 INSERT IGNORE INTO group_members (user_id, group_id, group_role, status)
-                VALUES (%s, %s, 'manager', 'active')
-            """, (creator_id, gid))
+                VALUES (%s, %s, %s, %s)
+            """, [(creator_id, gid, 'manager', 'active')]
+                + [(r['user_id'], gid, 'member', 'active') for r in cand_users])
+        _invalidate_group_counts()
 
         flash('Group created successfully', 'success')
         return redirect(url_for('groups_index'))
@@ -993,7 +1083,6 @@ def group_create():
 @require_platform_role('super_admin', 'support_technician')
 def group_edit(group_id):
     # Check if user can edit (only super_admin can POST/edit)
-    from eventbridge_plus.auth import is_super_admin
     can_edit = is_super_admin()
     
     if request.method == 'POST':
@@ -1012,11 +1101,11 @@ def group_edit(group_id):
 
         if not name:
             flash('Group name cannot be empty', 'danger');  return redirect(request.url)
-        if group_type not in GROUP_TYPES:
+        if group_type not in GROUP_TYPES_SET:
             flash('Group type illegal', 'danger');     return redirect(request.url)
         if max_members <= 0:
             flash('max_members Must be greater than 0', 'danger'); return redirect(request.url)
-        if HAS_LOCATION and location and location not in AVAILABLE_LOCATIONS:
+        if HAS_LOCATION and location and location not in AVAILABLE_LOCATIONS_SET:
             flash('Location not allowed', 'danger'); return redirect(request.url)
         
         # Check for duplicate group name (exclude current group)
@@ -1039,41 +1128,20 @@ def group_edit(group_id):
                         is_public=%s, max_members=%s
                     WHERE group_id=%s
                 """, (name, description, group_type, is_public, max_members, group_id))
+        _invalidate_group_caches(group_id)
+        _invalidate_group_counts()
 
         flash('Group information updated', 'success')
         return redirect(url_for('group_edit', group_id=group_id))
 
-    # GET: Query groups, members, and pending approval requests
+    # GET: Query groups, members, and pending approval requests (one round trip,
+    # one result set each)
     with db.get_cursor() as cur:
-        if HAS_LOCATION:
-            cur.execute("SELECT * FROM group_info WHERE group_id=%s", (group_id,))
-        else:
-            cur.execute("""
-                SELECT
-                    group_id, name, description, NULL AS location,
-                    group_type, is_public, max_members, status,
-                    first_members, created_by, created_at, updated_at
-                FROM group_info
-                WHERE group_id=%s
-            """, (group_id,))
+        cur.execute(_GROUP_EDIT_SQL, (group_id, group_id, group_id))
         group = cur.fetchone()
-
-        cur.execute("""
-            SELECT gm.membership_id, gm.user_id, u.username, gm.group_role, gm.status, gm.join_date
-            FROM group_members gm
-            JOIN users u ON gm.user_id = u.user_id
-            WHERE gm.group_id=%s
-            ORDER BY u.username
-        """, (group_id,))
+        cur.nextset()
         members = cur.fetchall()
-
-        cur.execute("""
-            SELECT r.request_id, r.user_id, u.username, r.message, r.requested_at
-            FROM group_requests r
-            JOIN users u ON u.user_id = r.user_id
-            WHERE r.group_id=%s AND r.status='pending'
-            ORDER BY r.requested_at ASC
-        """, (group_id,))
+        cur.nextset()
         pending_requests = cur.fetchall()
 
     return render_template(
@@ -1097,45 +1165,57 @@ def group_member_add(group_id):  # [ADDED]
         flash('Please enter usernames (comma-separated).', 'warning')
         return redirect(url_for('group_edit', group_id=group_id))
 
-    usernames = [x.strip() for x in members_csv.split(',') if x.strip()]
+    # distinct names, in the order given
+    usernames = list(dict.fromkeys(x.strip() for x in members_csv.split(',') if x.strip()))
     if not usernames:
         flash('No valid usernames found.', 'warning')
         return redirect(url_for('group_edit', group_id=group_id))
 
     with db.get_cursor() as cur:
+        # Only users without a membership row (active or pending) in this group,
+        # so every row returned is one to insert
         placeholders = ",".join(["%s"] * len(usernames))
-        cur.execute(
-            f"SELECT user_id, username FROM users WHERE username IN ({placeholders})",
-            tuple(usernames)
-        )
+        cur.execute(f"""
+            SELECT u.user_id, u.username
+            FROM users u
+            LEFT JOIN group_members gm ON gm.user_id = u.user_id AND gm.group_id = %s
+            WHERE u.username IN ({placeholders}) AND gm.user_id IS NULL
+        """, (group_id, *usernames))
         rows = cur.fetchall() or []
 
         if not rows:
-            flash('No matching users.', 'warning')
+            flash('No matching users who are not already in this group.', 'warning')
             return redirect(url_for('group_edit', group_id=group_id))
 
-        # capacity check
-        cur.execute("SELECT max_members FROM group_info WHERE group_id=%s", (group_id,))
+        # capacity check: limit and active member count in one query
+        cur.execute("""
+            SELECT g.max_members,
+                   (SELECT COUNT(*) FROM group_members
+                    WHERE group_id = g.group_id AND status = 'active') AS c
+            FROM group_info g
+            WHERE g.group_id = %s
+        """, (group_id,))
         grp = cur.fetchone() or {}
         max_members = grp.get('max_members') or 0
-
-        cur.execute("SELECT COUNT(*) AS c FROM group_members WHERE group_id=%s AND status='active'", (group_id,))
-        current = (cur.fetchone() or {}).get('c', 0)
+        current = grp.get('c', 0)
 
         can_add = max(0, max_members - current) if max_members else len(rows)
         rows_to_add = rows[:can_add]
 
         if rows_to_add:
+            # All placeholders, so executemany sends one multi-row INSERT
             cur.executemany("""
                 INSERT IGNORE INTO group_members (user_id, group_id, group_role, status)
-                VALUES (%s, %s, 'member', 'active')
-            """, [(r['user_id'], group_id) for r in rows_to_add])
+                VALUES (%s, %s, %s, %s)
+            """, [(r['user_id'], group_id, 'member', 'active') for r in rows_to_add])
 
         if len(rows_to_add) < len(rows):
             flash(f'Only added {len(rows_to_add)} (capacity reached).', 'warning')
         else:
             flash(f'Added {len(rows_to_add)} member(s).', 'success')
 
+    if rows_to_add:
+        _invalidate_group_caches(group_id)
     return redirect(url_for('group_edit', group_id=group_id))
 
 
@@ -1147,12 +1227,15 @@ def group_member_remove(group_id, user_id):  # [ADDED]
         # Remove from group
         cur.execute("DELETE FROM group_members WHERE group_id=%s AND user_id=%s", (group_id, user_id))
         
-        # Also remove from all events of this group
+        # Also remove from all events of this group: the user's rows come from
+        # uniq_user_event, the group's event ids from idx_group_id
         cur.execute("""
-            DELETE em FROM event_members em
-            JOIN event_info e ON em.event_id = e.event_id
-            WHERE em.user_id = %s AND e.group_id = %s
+            DELETE FROM event_members
+            WHERE user_id = %s
+              AND event_id IN (SELECT event_id FROM event_info WHERE group_id = %s)
         """, (user_id, group_id))
+    _invalidate_group_caches(group_id)
+    get_group_manager_ids.invalidate(group_id)
     
     flash('Member removed.', 'success')
     return redirect(url_for('group_edit', group_id=group_id))
@@ -1177,18 +1260,22 @@ def group_apply_submit_sql():
     if not name or not desc or not loc:
         return jsonify({"ok": False, "msg": "name/description/location required"}), 400
 
-    esc = lambda s: s.replace("'", "''")
-    sql = f"""
-        INSERT INTO group_info (name, description, group_location, max_members, status, created_by, created_at, updated_at)
-        VALUES ('{esc(name)}', '{esc(desc)}', '{esc(loc)}', {maxm if maxm is not None else 'NULL'},
-                'pending', {uid}, NOW(), NOW());
-    """
-    db.session.execute(sql)
-    new_id = db.session.execute("SELECT LAST_INSERT_ID();").scalar()
-    db.session.commit()
+    with db.get_cursor() as cur:
+        cur.execute("""
+            INSERT INTO group_info (name, description, group_location, max_members, status, created_by, created_at, updated_at)
+            VALUES (%s, %s, %s, COALESCE(%s, DEFAULT(max_members)), 'pending', %s, NOW(), NOW())
+        """, (name, desc, loc, maxm, uid))
+        new_id = cur.lastrowid
+    _invalidate_group_counts()
 
     try:
-        noti.send(uid, f'Submitted application for \"{name}\" (status: pending).')
+        noti.enqueue(
+            user_id=uid,
+            title='Group application submitted',
+            message=f'Submitted application for "{name}" (status: pending).',
+            category='group',
+            related_id=new_id
+        )
     except Exception:
         pass
 
@@ -1230,8 +1317,8 @@ def check_group_name_duplicate(name, exclude_group_id=None):
             result = cur.fetchone()
             return result['count'] > 0 if result else False
             
-    except Exception as e:
-        print(f"Error checking group name duplicate: {e}")
+    except Exception:
+        logger.exception("group name duplicate check failed (name=%r)", name)
         return False
 
 # helpers
@@ -1372,6 +1459,12 @@ def group_approve(group_id):  # [NEW]
             return redirect(url_for('groups_index'))
 
         cur.execute("UPDATE group_info SET status='approved', rejection_reason=NULL WHERE group_id=%s", (group_id,))
+        # Record who approved it (a re-approval replaces the earlier record)
+        cur.execute("""
+            INSERT INTO group_approvals (group_id, approver_id)
+            VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE approver_id = VALUES(approver_id), approved_at = CURRENT_TIMESTAMP
+        """, (group_id, admin_id))
 
         # Helper function to check and add user to group with 10-group limit
         def add_user_to_group_if_under_limit(user_id, group_id, role, user_description):
@@ -1398,6 +1491,9 @@ def group_approve(group_id):  # [NEW]
 
         # Register the approving admin as group manager (check 10 group limit)
         add_user_to_group_if_under_limit(admin_id, group_id, 'manager', 'Approving admin')
+    _invalidate_group_caches(group_id)
+    _invalidate_group_counts()
+    get_group_manager_ids.invalidate(group_id)
 
     try:
         if row and row.get('created_by'):
@@ -1424,16 +1520,6 @@ def group_approve(group_id):  # [NEW]
             category='group', 
             related_id=group_id
         )
-        
-        # Store approval record as system notification (for approver tracking)
-        approval_record_msg = f'APPROVED_GROUP:{group_id}:{row.get("name")}:{admin_id}'
-        noti.create_noti(
-            user_id=admin_id,
-            title='Group Approval Record',
-            message=approval_record_msg,
-            category='system',
-            related_id=group_id
-        )
     except Exception:
         pass
 
@@ -1461,12 +1547,13 @@ def group_reject(group_id):  # [CHANGED]
                 "UPDATE group_info SET status='rejected', rejection_reason=%s WHERE group_id=%s",
                 (enum_reason, group_id)
             )
-        except Exception as e:
-            print(f"Error updating rejection reason: {e}")
+        except Exception:
+            logger.exception("storing rejection reason failed, using 'other' (group_id=%s)", group_id)
             cur.execute(
                 "UPDATE group_info SET status='rejected', rejection_reason='other' WHERE group_id=%s",
                 (group_id,)
             )
+    _invalidate_group_counts()
 
     # Send notification without reason - users should contact helpdesk for details
     try:
@@ -1494,6 +1581,8 @@ def groups_edit_compat(group_id):
 def group_deactivate(group_id):
     with db.get_cursor() as cur:
         cur.execute("UPDATE group_info SET status='inactive' WHERE group_id=%s", (group_id,))
+    _invalidate_group_caches(group_id)
+    _invalidate_group_counts()
     flash('Group deactivated.', 'warning')
     return redirect(url_for('groups_index'))
 
@@ -1503,6 +1592,8 @@ def group_deactivate(group_id):
 def group_activate(group_id):
     with db.get_cursor() as cur:
         cur.execute("UPDATE group_info SET status='approved' WHERE group_id=%s", (group_id,))
+    _invalidate_group_caches(group_id)
+    _invalidate_group_counts()
     flash('Group activated.', 'success')
     return redirect(url_for('groups_index'))
 
@@ -1534,6 +1625,9 @@ def group_delete(group_id):
             pass
 
         cur.execute("DELETE FROM group_info WHERE group_id=%s", (group_id,))
+    _invalidate_group_caches(group_id)
+    _invalidate_group_counts()
+    get_group_manager_ids.invalidate(group_id)
 
     flash('Group deleted.', 'success')
     return redirect(url_for('groups_index'))
@@ -1583,8 +1677,8 @@ def admin_group_application_detail(group_id):
                              group_types=['activity', 'social', 'mixed'],
                              locations=['Auckland', 'Wellington', 'Christchurch', 'Hamilton', 'Tauranga', 'Napier', 'Dunedin', 'Palmerston North', 'Nelson', 'Rotorua'])
         
-    except Exception as e:
-        print(f"Error loading application details: {e}")
+    except Exception:
+        logger.exception("load group application failed (group_id=%s)", group_id)
         flash('Error loading application details', 'error')
         return redirect(url_for('groups_index'))
     
@@ -1634,8 +1728,9 @@ def _notify_event_participants(event_id: int, text: str):
     """Notify all participants of an event (best-effort)."""
     try:
         with db.get_cursor() as cur:
+            # uniq_user_event allows one row per user per event
             cur.execute("""
-                SELECT DISTINCT user_id
+                SELECT user_id
                 FROM event_members
                 WHERE event_id=%s
             """, (event_id,))
@@ -1660,7 +1755,6 @@ def _load_event(group_id, event_id):
 @require_login
 def events_cancel(group_id, event_id):
     # Allow platform admins to bypass group manager requirement
-    from .auth import is_super_admin, is_support_technician
     if not (is_super_admin() or is_support_technician()):
         uid = _require_group_manager_of(group_id)
         if not isinstance(uid, int):
@@ -1681,7 +1775,6 @@ def events_cancel(group_id, event_id):
 @require_login
 def events_delete(group_id, event_id):
     # Allow platform admins to bypass group manager requirement
-    from .auth import is_super_admin, is_support_technician
     if not (is_super_admin() or is_support_technician()):
         uid = _require_group_manager_of(group_id)
         if not isinstance(uid, int):
@@ -10,12 +10,19 @@ Handles all notification-related operations:
 """
 
 from eventbridge_plus import db, app
+import logging
 import smtplib
 import ssl
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 
+logger = logging.getLogger(__name__)
+
+# Background workers for fire-and-forget notification inserts
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='noti')
+
 
 def is_noti_enabled(user_id):
     """
@@ -41,6 +48,21 @@ def is_noti_enabled(user_id):
         return False
 
 
+_INSERT_NOTI_SQL = """
+    INSERT INTO notifications (user_id, title, message, category, related_id)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+
+def _safe_category(category):
+    """Normalize category to match DB enum/constraint"""
+    allowed_categories = { 'event', 'group', 'volunteer', 'system' }
+    # Map legacy/custom categories (store as 'system' to satisfy DB constraints)
+    if category == 'help_request':
+        return 'system'
+    return category if (category in allowed_categories) else 'system'
+
+
 def create_noti(user_id, title, message, category, related_id=None, *, force: bool = False):
     """
     Create a new notification
@@ -61,30 +83,116 @@ def create_noti(user_id, title, message, category, related_id=None, *, force: bo
     if (not force) and (not is_noti_enabled(user_id)):
         return None
     
-    # Normalize category to match DB enum/constraint
-    allowed_categories = { 'event', 'group', 'volunteer', 'system' }
-    # Map legacy/custom categories (store as 'system' to satisfy DB constraints)
-    if category == 'help_request':
-        safe_category = 'system'
-    else:
-        safe_category = category if (category in allowed_categories) else 'system'
+    with db.get_cursor() as cursor:
+        try:
+            cursor.execute(_INSERT_NOTI_SQL, (user_id, title, message, _safe_category(category), related_id))
+            return cursor.lastrowid
+            
+        except Exception:
+            return None
 
+
+def create_notis(rows, *, force: bool = False):
+    """
+    Create several notifications with a single multi-row INSERT
+    
+    Users with notifications disabled are skipped, as in create_noti().
+    
+    Args:
+        rows: Iterable of (user_id, title, message, category, related_id) tuples
+        
+    Returns:
+        int: Number of notifications created
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    
     with db.get_cursor() as cursor:
         try:
-            cursor.execute("""
-                INSERT INTO notifications (user_id, title, message, category, related_id)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (user_id, title, message, safe_category, related_id))
+            if not force:
+                # One settings lookup for every recipient
+                cursor.execute("""
+                    SELECT user_id
+                    FROM users
+                    WHERE user_id IN %s AND notifications_enabled
+                """, (tuple({row[0] for row in rows}),))
+                enabled = {r['user_id'] for r in cursor.fetchall()}
+                rows = [row for row in rows if row[0] in enabled]
+                if not rows:
+                    return 0
             
-            noti_id = cursor.lastrowid
-            try:
-                cursor.connection.commit()
-            except Exception:
-                pass
-            return noti_id
+            cursor.executemany(_INSERT_NOTI_SQL, [
+                (user_id, title, message, _safe_category(category), related_id)
+                for user_id, title, message, category, related_id in rows
+            ])
+            return len(rows)
             
         except Exception:
-            return None
+            logger.exception("Failed to create %d notification(s)", len(rows))
+            return 0
+
+
+def _do_create(rows, force):
+    """Worker body: insert notifications on a short-lived app-context connection.
+
+    Nobody waits on the Future, so failures are logged here rather than raised.
+    """
+    try:
+        with app.app_context():
+            create_notis(rows, force=force)
+    except Exception:
+        logger.exception("Background notification insert failed (%d row(s))", len(rows))
+
+
+def enqueue(user_id, title, message, category, related_id=None, *, force: bool = False):
+    """
+    Queue a notification to be created in the background
+    
+    The request returns without waiting for the INSERT. The worker opens its
+    own connection (released when its app context is torn down).
+    
+    Args:
+        Same as create_noti()
+        
+    Returns:
+        Future: Completes with None once the notification has been written
+    """
+    return _executor.submit(_do_create, [(user_id, title, message, category, related_id)], force)
+
+
+def enqueue_many(user_ids, title, message, category, related_id=None, *, force: bool = False):
+    """
+    Queue the same notification for several users as a single background job
+    
+    Args:
+        user_ids: Iterable of user IDs to notify
+        title, message, category, related_id, force: Same as create_noti()
+        
+    Returns:
+        Future or None: None when there is nobody to notify
+    """
+    rows = [(uid, title, message, category, related_id) for uid in user_ids]
+    if not rows:
+        return None
+    return _executor.submit(_do_create, rows, force)
+
+
+def enqueue_rows(rows, *, force: bool = False):
+    """
+    Queue several different notifications as a single background job
+    
+    Args:
+        rows: Iterable of (user_id, title, message, category, related_id) tuples
+        force: Same as create_noti()
+        
+    Returns:
+        Future or None: None when there is nobody to notify
+    """
+    rows = list(rows)
+    if not rows:
+        return None
+    return _executor.submit(_do_create, rows, force)
 
 
 def toggle_noti_setting(user_id, enabled):
@@ -19,7 +19,8 @@ from eventbridge_plus.auth import (
     require_login,
     require_platform_role,
     get_current_user_id,
-    is_super_admin
+    is_super_admin,
+    get_group_manager_ids
 )
 
 
@@ -453,6 +454,7 @@ def admin_ban_user(user_id: int):
                     """, (next_manager['membership_id'],))
                     
                     promoted_managers.append({
+                        'group_id': group['group_id'],
                         'group_name': group['group_name'],
                         'new_manager': next_manager
                     })
@@ -483,6 +485,9 @@ def admin_ban_user(user_id: int):
 
             cur.connection.commit()
 
+        for pm in promoted_managers:
+            get_group_manager_ids.invalidate(pm['group_id'])
+
         # Prepare success message
         success_msg = f"User {target['username']} has been banned."
         if promoted_managers:
@@ -11,8 +11,14 @@ except Exception:  # pragma: no cover
     ZoneInfo = None  # Fallback if unavailable; we will guard usage
     class ZoneInfoNotFoundError(Exception):
         pass
+import base64
+import json
 import os
+import re
+import threading
 import uuid
+from functools import wraps
+from time import monotonic
 from flask import current_app
 from werkzeug.utils import secure_filename
 
@@ -253,6 +259,46 @@ def remove_uploaded_file(rel_path: str) -> bool:
             return False
     return False
 
+def ttl_cache(seconds: float, maxsize: int = 1024):
+    """
+    Memoize a function per positional-argument tuple for `seconds`.
+    Process-local; intended for small, rarely-changing lookups.
+
+    The wrapped function also gets:
+        invalidate(*args) - drop the entry for those arguments
+        cache_clear()     - drop every entry
+    """
+    def decorator(func):
+        store = {}
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args):
+            now = monotonic()
+            with lock:
+                hit = store.get(args)
+            if hit is not None and hit[1] > now:
+                return hit[0]
+            value = func(*args)
+            with lock:
+                if args not in store and len(store) >= maxsize:
+                    store.pop(next(iter(store)))
+                store[args] = (value, now + seconds)
+            return value
+
+        def invalidate(*args):
+            with lock:
+                store.pop(args, None)
+
+        def cache_clear():
+            with lock:
+                store.clear()
+
+        wrapper.invalidate = invalidate
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
 
 
 # User roles
@@ -278,6 +324,10 @@ AVAILABLE_EVENT_TYPES = [
     'Marathon'
 ]
 
+# Search: characters with a meaning in FULLTEXT BOOLEAN MODE; queries
+# containing them use LIKE
+FULLTEXT_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
 # File upload settings
 UPLOAD_FOLDER = 'static/uploads/profile_pics'
 CSV_UPLOAD_FOLDER = 'static/uploads/csv_results'
@@ -442,4 +492,36 @@ def create_pagination_links(pagination_info, max_links=5):
             'is_current': page_num == current_page
         })
     
-    return links
\ No newline at end of file
+    return links
+
+def encode_page_cursor(*values):
+    """
+    Encode the sort key of the last row on a page as an opaque URL token.
+    
+    Args:
+        *values: JSON-serialisable sort key values (dates should be passed as str)
+    
+    Returns:
+        str: URL-safe token for the 'after' query parameter
+    """
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_page_cursor(token):
+    """
+    Decode a token produced by encode_page_cursor().
+    
+    Args:
+        token (str): Token from the request, may be None or malformed
+    
+    Returns:
+        list: The encoded sort key values, or None if the token is invalid
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw.decode('utf-8'))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None